@@ -1,6 +1,8 @@
 import os
 import json
+import asyncio
 import time
+import queue
 import threading
 import argparse
 from datetime import datetime
@@ -8,16 +10,15 @@ from datetime import datetime
 import cv2
 import numpy as np
 import mediapipe as mp
+from mediapipe.framework.formats import landmark_pb2
 from loguru import logger
 from django.core.management.base import BaseCommand
 from django.conf import settings
 from channels.layers import get_channel_layer
-from asgiref.sync import async_to_sync
 
 from climber.models import Wall, WallCalibration, Session
 from climber.svg_utils import SVGParser
 from climber.calibration.aruco_detector import ArUcoDetector
-from climber.calibration.calibration_utils import CalibrationUtils
 
 
 class PoseTouchDetector:
@@ -27,9 +28,20 @@ class PoseTouchDetector:
     and WebSocket streaming.
     """
     
+    # Long side of the image handed to MediaPipe, matching its 256px model input
+    INFERENCE_SIZE = 256
+    
+    # Pose landmark indices averaged into each hand position
+    LEFT_HAND_LANDMARKS = [17, 19, 21]  # Wrist, index finger tip, pinky tip
+    RIGHT_HAND_LANDMARKS = [18, 20]  # Wrist, index finger tip
+    
+    # Touch updates arriving within this window are coalesced into one send
+    SEND_COALESCE_SECONDS = 0.05
+    
     def __init__(self, wall_id, session_id=None, camera_source=0,
                  fake_pose=False, video_file=None, loop=False, touch_threshold=0.1,
-                 debug=False, show_video=False, show_skeleton=False, show_svg=False):
+                 debug=False, show_video=False, show_skeleton=False, show_svg=False,
+                 model_complexity=0, pose_model=None, gpu=False):
         """
         Initialize pose touch detector.
         
@@ -45,7 +57,18 @@ class PoseTouchDetector:
             show_video: Display the video feed with OpenCV
             show_skeleton: Display the detected skeleton overlay
             show_svg: Display the SVG holds overlay
+            model_complexity: MediaPipe pose model (0 = lite, 1 = full, 2 = heavy).
+                The lite model is 2-3x faster on CPU and tracks the same 33
+                landmarks, which is plenty for averaged hand positions.
+            pose_model: Path to a MediaPipe Tasks .task pose landmarker model. When
+                given, inference runs through the Tasks API instead of solutions.pose.
+            gpu: Run the Tasks API pose landmarker on the GPU delegate
         """
+        # Per-frame OpenCV kernels here are small; keep OpenCV single-threaded so
+        # its pool does not contend with MediaPipe's, and make sure SIMD paths are on
+        cv2.setUseOptimized(True)
+        cv2.setNumThreads(1)
+        
         self.wall_id = wall_id
         self.session_id = session_id
         self.camera_source = camera_source
@@ -57,42 +80,68 @@ class PoseTouchDetector:
         self.show_video = show_video
         self.show_skeleton = show_skeleton
         self.show_svg = show_svg
+        self.model_complexity = model_complexity
+        self.pose_model = pose_model
+        self.gpu = gpu
         
         # Initialize MediaPipe
         self.mp_pose = mp.solutions.pose
-        self.mp_hands = mp.solutions.hands
-        self.pose = self.mp_pose.Pose(
-            static_image_mode=False,
-            model_complexity=1,
-            enable_segmentation=False,
-            min_detection_confidence=0.5,
-            min_tracking_confidence=0.5
-        )
-        self.hands = self.mp_hands.Hands(
-            static_image_mode=False,
-            max_num_hands=2,
-            min_detection_confidence=0.5,
-            min_tracking_confidence=0.5
-        )
+        self._last_timestamp_ms = 0
+        if pose_model:
+            self.pose = self._create_pose_landmarker(pose_model, gpu)
+        else:
+            if gpu:
+                logger.warning("--gpu requires --pose-model; using the CPU solutions.pose model")
+            self.pose = self.mp_pose.Pose(
+                static_image_mode=False,
+                model_complexity=model_complexity,
+                enable_segmentation=False,
+                min_detection_confidence=0.5,
+                min_tracking_confidence=0.5
+            )
         
         # Initialize components
         self.wall = None
         self.calibration = None
+        self.transform_matrix = None
         self.svg_parser = None
         self.channel_layer = get_channel_layer()
-        logger.info(self.channel_layer)
         
         # Camera setup
         self.cap = None
         self.running = False
         
+        # Capture -> inference -> display pipeline. Each stage hands over through a
+        # single-slot queue so no stage ever works through a backlog of stale frames.
+        self._capture_thread = None
+        self._inference_thread = None
+        self._frame_q = queue.Queue(maxsize=1)
+        self._result_q = queue.Queue(maxsize=1)
+        
+        # Preallocated downscale and RGB buffers for inference (sized on first frame)
+        self._small_buf = None
+        self._rgb_buf = None
+        
         # Previous touched objects for change detection
         self.previous_touched = set()
         
+        # Persistent event loop for channel layer sends, started on first use
+        self._send_loop = None
+        self._send_thread = None
+        self._pending_message = None
+        self._flush_handle = None
+        
         # Visualization setup
         self.mp_drawing = mp.solutions.drawing_utils
         self.mp_drawing_styles = mp.solutions.drawing_styles
         self.svg_overlay = None
+        self.svg_overlay_mask = None
+        self._blend_buf = None
+        self.precomputed_paths = {}
+        
+        # Camera-plane label image: pixel value i > 0 means SVG path path_id_by_index[i - 1]
+        self.touch_mask = None
+        self.path_id_by_index = []
         
         # Video orientation handling
         self.needs_rotation = False
@@ -101,6 +150,10 @@ class PoseTouchDetector:
         self.display_width = 1280
         self.display_height = 720
         
+        # Normalized landmark -> pixel scale (width, height) used for touch lookup.
+        # Default camera resolution; video files update it to their display size.
+        self._px_scale = np.array([1280, 720], dtype=np.float32)
+        
         logger.info(f"Initialized PoseTouchDetector for wall {wall_id}")
     
     def setup(self):
@@ -123,6 +176,9 @@ class PoseTouchDetector:
             logger.error(f"No calibration found for wall {self.wall.name}")
             return False
         
+        # Contiguous float32 so cv2.perspectiveTransform uses it without conversion
+        self.transform_matrix = np.ascontiguousarray(self.calibration.perspective_transform, dtype=np.float32)
+        
         # Setup SVG parser
         if not self.wall.svg_file:
             logger.error(f"No SVG file associated with wall {self.wall.name}")
@@ -138,9 +194,8 @@ class PoseTouchDetector:
         self.svg_parser.paths = self.svg_parser.extract_paths()
         logger.info(f"Loaded SVG with {len(self.svg_parser.paths)} paths")
         
-        # Setup SVG overlay if visualization is enabled
-        if self.show_svg:
-            self._setup_svg_overlay()
+        # Pre-compute matplotlib Path objects and bounding boxes for the fallback touch check
+        self.precomputed_paths = self.svg_parser.precompute_paths()
         
         # Setup camera or video file
         if self.fake_pose:
@@ -169,11 +224,19 @@ class PoseTouchDetector:
                 return False
             self.is_video_file = False
             
+            # Keep the driver-side queue to a single frame so reads return the
+            # freshest frame instead of draining stale buffered ones
+            self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+            
             # Set camera properties
             self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, 1280)
             self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 720)
             self.cap.set(cv2.CAP_PROP_FPS, 30)
         
+        # Project the SVG paths onto the camera plane once the frame size is known.
+        # Builds the touch lookup mask, plus the visual overlay if enabled.
+        self._setup_svg_overlay()
+        
         logger.info("Setup complete")
         return True
     
@@ -245,6 +308,8 @@ class PoseTouchDetector:
                 self.needs_resize = True
                 self.display_width, self.display_height = actual_frame_height, actual_frame_width
         
+        self._px_scale = np.array([int(self.display_width), int(self.display_height)], dtype=np.float32)
+        
         logger.info(f"Video: {self.video_file}")
         logger.info(f"Stored Resolution: {width}x{height}")
         logger.info(f"Actual Frame Resolution: {actual_frame_width}x{actual_frame_height}")
@@ -260,29 +325,36 @@ class PoseTouchDetector:
             logger.info(f"Display Resolution: {actual_frame_width}x{actual_frame_height} (no transformation needed)")
     
     def _setup_svg_overlay(self):
-        """Setup SVG overlay for visualization using calibration data."""
+        """
+        Project SVG paths onto the camera plane using calibration data.
+        
+        Always builds the touch lookup mask; the visualization overlay is only
+        drawn when show_svg is enabled.
+        """
         try:
             # Get SVG dimensions
             svg_width, svg_height = self.svg_parser.get_svg_dimensions()
             logger.info(f"SVG dimensions: {svg_width}x{svg_height}")
             
-            # Create a blank image for SVG overlay with the same dimensions as the video
-            self.svg_overlay = np.zeros((int(self.display_height), int(self.display_width), 3), dtype=np.uint8)
+            frame_shape = (int(self.display_height), int(self.display_width))
             
-            # Initialize calibration utils
-            calibration_utils = CalibrationUtils()
+            # Label image mapping each camera pixel to the path drawn there (0 = none)
+            touch_mask = np.zeros(frame_shape, dtype=np.uint16)
+            path_id_by_index = []
+            
+            # Create a blank image for SVG overlay with the same dimensions as the video
+            if self.show_svg:
+                self.svg_overlay = np.zeros(frame_shape + (3,), dtype=np.uint8)
             
             # Get the transformation matrix for SVG to camera coordinates
             # The calibration transforms camera coordinates to SVG coordinates,
             # so we need to use the inverse to transform SVG to camera coordinates
             try:
-                # Load the perspective transform from calibration
-                # Convert from JSON to numpy array
-                transform_matrix = np.array(self.calibration.perspective_transform, dtype=np.float32)
-                
-                # We'll use the calibration_utils.transform_points_from_svg method
-                # which handles the matrix inversion internally
-                inv_transform_matrix = transform_matrix  # Keep for compatibility with existing code
+                # Reuse the perspective transform loaded in setup(); invert in
+                # double precision, once for all paths. cv2.invert returns (retval, matrix)
+                success, inv_transform_matrix = cv2.invert(self.transform_matrix.astype(np.float64))
+                if not success:
+                    raise ValueError("calibration matrix is not invertible")
                 
                 logger.info("Using calibration transformation for SVG overlay")
             except Exception as e:
@@ -296,42 +368,126 @@ class PoseTouchDetector:
                 logger.info(f"Falling back to simple scaling: X={scale_x}, Y={scale_y}, Using={scale}")
                 inv_transform_matrix = None
             
-            # Draw SVG paths on the overlay
+            # Collect every path polygon in SVG coordinates
+            path_ids = []
+            polygons = []
             for path_id, path_data in self.svg_parser.paths.items():
                 try:
                     # Use path_to_polygon method to get a better representation of the path
                     polygon_points = self.svg_parser.path_to_polygon(path_data['d'], num_points=100)
                     
                     if polygon_points is not None and len(polygon_points) > 0:
-                        if inv_transform_matrix is not None:
-                            # Transform SVG points to camera coordinates using calibration
-                            transformed_points = calibration_utils.transform_points_from_svg(
-                                polygon_points, transform_matrix
-                            )
-                            polygon_points = np.array(transformed_points)
-                        else:
-                            # Fallback to simple scaling
-                            polygon_points[:, 0] = polygon_points[:, 0] * scale + offset_x
-                            polygon_points[:, 1] = polygon_points[:, 1] * scale + offset_y
-                        
-                        # Convert to integer for OpenCV
-                        points = polygon_points.astype(np.int32)
-                        
-                        # Draw the path as a filled polygon with more visible colors
-                        cv2.fillPoly(self.svg_overlay, [points], (0, 255, 0))  # Green holds
-                        cv2.polylines(self.svg_overlay, [points], True, (0, 150, 0), 2)  # Darker green outline
-                        
-                        logger.debug(f"Drew path {path_id} with {len(points)} points")
+                        path_ids.append(path_id)
+                        polygons.append(np.asarray(polygon_points, dtype=np.float64).reshape(-1, 2))
                     else:
                         logger.warning(f"Failed to extract polygon for path {path_id}")
                 except Exception as e:
                     logger.warning(f"Error drawing path {path_id}: {e}")
                     continue
             
-            logger.info("SVG overlay created for visualization")
+            if polygons:
+                # Warp all vertices in one call, then split back per path
+                all_points = np.concatenate(polygons)
+                if inv_transform_matrix is not None:
+                    # Transform SVG points to camera coordinates using calibration
+                    all_points = cv2.perspectiveTransform(
+                        all_points.reshape(-1, 1, 2), inv_transform_matrix
+                    ).reshape(-1, 2)
+                else:
+                    # Fallback to simple scaling
+                    all_points = all_points * scale + (offset_x, offset_y)
+                
+                split_at = np.cumsum([len(polygon) for polygon in polygons])[:-1]
+                polygons = np.split(all_points, split_at)
+            
+            # Convert to integer for OpenCV
+            polygons = [polygon_points.astype(np.int32) for polygon_points in polygons]
+            
+            # Rasterize each path into the label mask; labels differ per path,
+            # so this is the one fill that has to stay per polygon
+            for path_id, points in zip(path_ids, polygons):
+                path_id_by_index.append(path_id)
+                cv2.fillPoly(touch_mask, [points], len(path_id_by_index))
+                logger.debug(f"Drew path {path_id} with {len(points)} points")
+            
+            # Draw all SVG paths on the overlay at once. The fill comes from the
+            # label mask: a single multi-polygon fillPoly would XOR overlapping paths.
+            if self.svg_overlay is not None and polygons:
+                self.svg_overlay[touch_mask > 0] = (0, 255, 0)  # Green holds
+                cv2.polylines(self.svg_overlay, polygons, True, (0, 150, 0), 2)  # Darker green outline
+            
+            # Only trust the mask when it was projected with the real calibration
+            if inv_transform_matrix is not None:
+                self.touch_mask = touch_mask
+                self.path_id_by_index = path_id_by_index
+                logger.info(f"Touch mask built for {len(path_id_by_index)} paths")
+            if self.svg_overlay is not None:
+                # Static overlay: compute its blend mask once, not per frame
+                self.svg_overlay_mask = np.any(self.svg_overlay > 0, axis=2).astype(np.uint8) * 255
+                logger.info("SVG overlay created for visualization")
         except Exception as e:
             logger.error(f"Failed to create SVG overlay: {e}")
             self.svg_overlay = None
+            self.svg_overlay_mask = None
+            self.touch_mask = None
+    
+    @staticmethod
+    def _create_pose_landmarker(model_path, gpu):
+        """
+        Create a Tasks API pose landmarker, on the GPU delegate if requested.
+        
+        Falls back to the CPU delegate when the GPU one cannot be created.
+        """
+        from mediapipe.tasks import python as mp_tasks
+        from mediapipe.tasks.python import vision
+        
+        def create(delegate):
+            options = vision.PoseLandmarkerOptions(
+                base_options=mp_tasks.BaseOptions(model_asset_path=model_path, delegate=delegate),
+                running_mode=vision.RunningMode.VIDEO,
+                num_poses=1,
+                min_pose_detection_confidence=0.5,
+                min_tracking_confidence=0.5
+            )
+            return vision.PoseLandmarker.create_from_options(options)
+        
+        if gpu:
+            try:
+                landmarker = create(mp_tasks.BaseOptions.Delegate.GPU)
+                logger.info(f"Pose landmarker {model_path} running on GPU delegate")
+                return landmarker
+            except Exception as e:
+                logger.warning(f"GPU delegate unavailable, falling back to CPU: {e}")
+        
+        landmarker = create(mp_tasks.BaseOptions.Delegate.CPU)
+        logger.info(f"Pose landmarker {model_path} running on CPU delegate")
+        return landmarker
+    
+    def _detect_pose(self, rgb_frame):
+        """
+        Run pose inference on an RGB frame.
+        
+        Returns:
+            NormalizedLandmarkList for the detected person, or None
+        """
+        if not self.pose_model:
+            return self.pose.process(rgb_frame).pose_landmarks
+        
+        # VIDEO mode needs strictly increasing timestamps
+        timestamp_ms = max(int(time.monotonic() * 1000), self._last_timestamp_ms + 1)
+        self._last_timestamp_ms = timestamp_ms
+        image = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb_frame)
+        result = self.pose.detect_for_video(image, timestamp_ms)
+        if not result.pose_landmarks:
+            return None
+        
+        # Same landmark container solutions.pose returns, so drawing works unchanged
+        landmarks = landmark_pb2.NormalizedLandmarkList()
+        landmarks.landmark.extend(
+            landmark_pb2.NormalizedLandmark(x=lm.x, y=lm.y, z=lm.z, visibility=lm.visibility or 0.0)
+            for lm in result.pose_landmarks[0]
+        )
+        return landmarks
     
     def detect_touches(self, frame):
         """
@@ -344,89 +500,86 @@ class PoseTouchDetector:
             Tuple of (touched_objects, annotated_frame)
         """
         
-        # Convert BGR to RGB
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        # Downscale to the model input size before converting BGR to RGB.
+        # Aspect ratio is kept, and landmarks come back normalized, so the
+        # full-resolution frame stays valid for drawing and touch lookup.
+        h, w = frame.shape[:2]
+        scale = min(self.INFERENCE_SIZE / max(h, w), 1.0)
+        small_w, small_h = round(w * scale), round(h * scale)
         
-        # Process with MediaPipe
-        pose_results = self.pose.process(rgb_frame)
+        # Reuse the inference buffers across frames; reallocate only on size change
+        if self._rgb_buf is None or self._rgb_buf.shape[:2] != (small_h, small_w):
+            self._small_buf = np.empty((small_h, small_w, 3), dtype=np.uint8)
+            self._rgb_buf = np.empty((small_h, small_w, 3), dtype=np.uint8)
+        
+        if scale < 1.0:
+            small_frame = cv2.resize(frame, (small_w, small_h), dst=self._small_buf,
+                                     interpolation=cv2.INTER_AREA)
+        else:
+            small_frame = frame
+        rgb_frame = cv2.cvtColor(small_frame, cv2.COLOR_BGR2RGB, dst=self._rgb_buf)
+        
+        # Process with MediaPipe. A read-only array is passed by reference
+        # instead of being copied; the buffer is reused, so unlock it afterwards.
+        rgb_frame.flags.writeable = False
+        try:
+            pose_landmarks = self._detect_pose(rgb_frame)
+        finally:
+            rgb_frame.flags.writeable = True
         #hand_results = self.hands.process(rgb_frame)
         
         touched_objects = set()
-        annotated_frame = frame.copy()
+        # Only the skeleton overlay draws on the frame; skip the copy otherwise
+        annotated_frame = frame.copy() if self.show_skeleton else frame
         
-        if pose_results.pose_landmarks:
+        if pose_landmarks:
             # Draw skeleton on frame if enabled
             if self.show_skeleton:
                 self.mp_drawing.draw_landmarks(
                     annotated_frame,
-                    pose_results.pose_landmarks,
+                    pose_landmarks,
                     self.mp_pose.POSE_CONNECTIONS,
                     landmark_drawing_spec=self.mp_drawing_styles.get_default_pose_landmarks_style()
                 )
             
-            # Get hand landmarks from pose
-            #logger.info(f"Detected {pose_results.pose_landmarks}")
-            left_hand_landmarks = []
-            right_hand_landmarks = []
+            # Get hand landmarks from pose as one (33, 2) array of normalized x, y
+            landmarks = pose_landmarks.landmark
+            landmark_xy = np.fromiter(
+                (v for landmark in landmarks for v in (landmark.x, landmark.y)),
+                dtype=np.float32, count=2 * len(landmarks)
+            ).reshape(-1, 2)
+            left_hand_landmarks = landmark_xy[self.LEFT_HAND_LANDMARKS]
+            right_hand_landmarks = landmark_xy[self.RIGHT_HAND_LANDMARKS]
             
-            # Left hand landmarks (pose indices 17-21)
-            for i in [17, 19, 21]:  # Wrist, index finger tip, pinky tip
-                landmark = pose_results.pose_landmarks.landmark[i]
-                left_hand_landmarks.append([landmark.x, landmark.y])
-                
-                # Draw hand landmarks if skeleton visualization is enabled
-                if self.show_skeleton:
-                    x = int(landmark.x * annotated_frame.shape[1])
-                    y = int(landmark.y * annotated_frame.shape[0])
-                    cv2.circle(annotated_frame, (x, y), 5, (0, 0, 255), -1)  # Red for left hand
-            
-            # Right hand landmarks (pose indices 18-20)
-            for i in [18, 20]:  # Wrist, index finger tip
-                landmark = pose_results.pose_landmarks.landmark[i]
-                right_hand_landmarks.append([landmark.x, landmark.y])
-                
-                # Draw hand landmarks if skeleton visualization is enabled
-                if self.show_skeleton:
-                    x = int(landmark.x * annotated_frame.shape[1])
-                    y = int(landmark.y * annotated_frame.shape[0])
-                    cv2.circle(annotated_frame, (x, y), 5, (255, 0, 0), -1)  # Blue for right hand
-            
-            # Add hand-specific landmarks if available
-            # if hand_results.multi_hand_landmarks:
-            #     for hand_idx, hand_landmarks in enumerate(hand_results.multi_hand_landmarks):
-            #         handedness = hand_results.multi_handedness[hand_idx].classification[0].label
-                    
-            #         # Get finger tips (indices 4, 8, 12, 16, 20)
-            #         for tip_idx in [4, 8, 12, 16, 20]:
-            #             landmark = hand_landmarks.landmark[tip_idx]
-            #             if handedness == "Left":
-            #                 left_hand_landmarks.append([landmark.x, landmark.y])
-            #             else:
-            #                 right_hand_landmarks.append([landmark.x, landmark.y])
-            
-            # Calculate average hand positions
-            if left_hand_landmarks:
-                left_hand_pos = np.mean(left_hand_landmarks, axis=0)
-                touched_objects.update(self._check_touch_at_position(left_hand_pos))
-                
-                # Draw touch indicator if visualization is enabled
-                if self.show_skeleton and touched_objects:
-                    x = int(left_hand_pos[0] * annotated_frame.shape[1])
-                    y = int(left_hand_pos[1] * annotated_frame.shape[0])
-                    cv2.circle(annotated_frame, (x, y), 15, (0, 255, 0), 3)  # Green circle for touch
-            
-            if right_hand_landmarks:
-                right_hand_pos = np.mean(right_hand_landmarks, axis=0)
-                touched_objects.update(self._check_touch_at_position(right_hand_pos))
-                
-                # Draw touch indicator if visualization is enabled
-                if self.show_skeleton and touched_objects:
-                    x = int(right_hand_pos[0] * annotated_frame.shape[1])
-                    y = int(right_hand_pos[1] * annotated_frame.shape[0])
-                    cv2.circle(annotated_frame, (x, y), 15, (0, 255, 0), 3)  # Green circle for touch
-        
-        if len(touched_objects):
-            logger.info(f"Touched: {touched_objects}")
+            # Draw hand landmarks if skeleton visualization is enabled
+            frame_size = np.array(annotated_frame.shape[1::-1], dtype=np.float32)
+            if self.show_skeleton:
+                for x, y in (left_hand_landmarks * frame_size).astype(np.int32):
+                    cv2.circle(annotated_frame, (int(x), int(y)), 5, (0, 0, 255), -1)  # Red for left hand
+                for x, y in (right_hand_landmarks * frame_size).astype(np.int32):
+                    cv2.circle(annotated_frame, (int(x), int(y)), 5, (255, 0, 0), -1)  # Blue for right hand
+            
+            # Calculate average hand positions and check both in one batch
+            left_hand_pos = left_hand_landmarks.mean(axis=0)
+            right_hand_pos = right_hand_landmarks.mean(axis=0)
+            left_touched, right_touched = self._check_touches_batch([left_hand_pos, right_hand_pos])
+            touched_objects.update(left_touched)
+            
+            # Draw touch indicator if visualization is enabled
+            if self.show_skeleton and touched_objects:
+                x, y = (left_hand_pos * frame_size).astype(np.int32)
+                cv2.circle(annotated_frame, (int(x), int(y)), 15, (0, 255, 0), 3)  # Green circle for touch
+            
+            touched_objects.update(right_touched)
+            
+            # Draw touch indicator if visualization is enabled
+            if self.show_skeleton and touched_objects:
+                x, y = (right_hand_pos * frame_size).astype(np.int32)
+                cv2.circle(annotated_frame, (int(x), int(y)), 15, (0, 255, 0), 3)  # Green circle for touch
+        
+        # Per-frame log: arguments are only formatted when DEBUG is enabled
+        if touched_objects:
+            logger.debug("Touched: {}", touched_objects)
         return list(touched_objects), annotated_frame
     
     def _check_touch_at_position(self, position):
@@ -439,31 +592,49 @@ class PoseTouchDetector:
         Returns:
             Set of touched object IDs
         """
-        # Convert normalized position to image coordinates
-        # Use actual video dimensions instead of hardcoded values
-        if self.video_file:
-            h, w = int(self.display_height), int(self.display_width)
-        else:
-            h, w = 720, 1280  # Default camera resolution
-        img_x = int(position[0] * w)
-        img_y = int(position[1] * h)
-        
-        # Transform to SVG coordinates using calibration
-        calibration_utils = CalibrationUtils()
-        # Convert from JSON to numpy array
-        transform_matrix = np.array(self.calibration.perspective_transform, dtype=np.float32)
-        svg_point = calibration_utils.transform_point_to_svg(
-            (img_x, img_y),
-            transform_matrix
-        )
+        return self._check_touches_batch([position])[0]
+    
+    def _check_touches_batch(self, positions):
+        """
+        Check which SVG objects each of several positions touches.
         
-        # Check which SVG paths contain this point
-        touched_objects = set()
-        for path_id, path_data in self.svg_parser.paths.items():
-            if self.svg_parser.point_in_path((svg_point[0], svg_point[1]), path_data['d']):
-                touched_objects.add(path_id)
+        Args:
+            positions: Normalized positions, array-like of shape (N, 2) with x,y in [0,1]
+            
+        Returns:
+            List of N sets of touched object IDs, one per position
+        """
+        # Convert normalized positions to image coordinates
+        img_points = (np.asarray(positions, dtype=np.float32).reshape(-1, 2) * self._px_scale).astype(np.int32)
         
-        return touched_objects
+        # Paths were rasterized onto the camera plane at setup: one array lookup
+        if self.touch_mask is not None:
+            mask_h, mask_w = self.touch_mask.shape
+            xs, ys = img_points[:, 0], img_points[:, 1]
+            inside = (xs >= 0) & (xs < mask_w) & (ys >= 0) & (ys < mask_h)
+            labels = np.zeros(len(img_points), dtype=self.touch_mask.dtype)
+            labels[inside] = self.touch_mask[ys[inside], xs[inside]]
+            return [{self.path_id_by_index[idx - 1]} if idx else set() for idx in labels]
+        
+        if not self.precomputed_paths:
+            return [set() for _ in img_points]
+        
+        # Fallback when the mask could not be built: transform all points to SVG
+        # coordinates with one perspectiveTransform call
+        svg_points = cv2.perspectiveTransform(
+            img_points.reshape(-1, 1, 2).astype(np.float32),
+            self.transform_matrix
+        ).reshape(-1, 2)
+        
+        # Check which SVG paths contain each point (bounding box rejection first)
+        touched = []
+        for svg_x, svg_y in svg_points:
+            touched.append({
+                path_id for path_id, precomputed in self.precomputed_paths.items()
+                if SVGParser.point_in_precomputed_path((svg_x, svg_y), precomputed)
+            })
+        
+        return touched
     
     def stream_touched_objects(self, touched_objects):
         """
@@ -490,23 +661,77 @@ class PoseTouchDetector:
             'touched_objects': list(current_touched)
         }
         
-        # Send to WebSocket
+        # Hand off to the send loop, which coalesces bursts into one send
+        if self._send_loop is None:
+            self._start_send_loop()
+        self._send_loop.call_soon_threadsafe(self._queue_message, message)
+    
+    def _start_send_loop(self):
+        """Start the background event loop used for all channel layer sends."""
+        self._send_loop = asyncio.new_event_loop()
+        self._send_thread = threading.Thread(
+            target=self._send_loop.run_forever, name="pose-send", daemon=True
+        )
+        self._send_thread.start()
+    
+    def _queue_message(self, message):
+        """Store the newest message and arm the coalescing timer (send loop only)."""
+        self._pending_message = message
+        if self._flush_handle is None:
+            self._flush_handle = self._send_loop.call_later(
+                self.SEND_COALESCE_SECONDS, self._flush_pending
+            )
+    
+    def _flush_pending(self):
+        """Send whatever message is pending (send loop only)."""
+        self._flush_handle = None
+        message, self._pending_message = self._pending_message, None
+        if message is not None:
+            self._send_loop.create_task(self._send_message(message))
+    
+    async def _send_message(self, message):
+        """Send one touch update to the session group."""
         try:
-            async_to_sync(self.channel_layer.group_send)(
+            await self.channel_layer.group_send(
                 f"session_{self.session_id}",
                 {
                     'type': 'pose_touch_message',
                     'message': message
                 }
             )
-            logger.debug(f"Sent touch update: {current_touched}")
+            logger.debug("Sent touch update: {}", message['touched_objects'])
         except Exception as e:
             logger.error(f"Failed to send WebSocket message: {e}")
     
+    async def _drain_send_loop(self):
+        """Send any pending message immediately, ahead of shutdown."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+        self._flush_handle = None
+        message, self._pending_message = self._pending_message, None
+        if message is not None:
+            await self._send_message(message)
+    
+    def _stop_send_loop(self):
+        """Flush the last touch update and stop the send loop thread."""
+        if self._send_loop is None:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._drain_send_loop(), self._send_loop).result(timeout=1.0)
+        except Exception as e:
+            logger.error(f"Failed to flush WebSocket messages: {e}")
+        self._send_loop.call_soon_threadsafe(self._send_loop.stop)
+        self._send_thread.join(timeout=1.0)
+        self._send_loop = None
+        self._send_thread = None
+    
     def _display_frame(self, frame, touched_objects):
         """
         Display frame with optional overlays.
         
+        Overlays are drawn in place: the frame comes off the result queue and
+        is not used again after display.
+        
         Args:
             frame: Camera frame
             touched_objects: List of touched object IDs
@@ -514,25 +739,24 @@ class PoseTouchDetector:
         if not self.show_video:
             return
         
-        display_frame = frame.copy()
+        display_frame = frame
         
         # Add SVG overlay if enabled
         if self.show_svg and self.svg_overlay is not None:
-            # Resize SVG overlay to match frame dimensions
+            # Resize SVG overlay to match frame dimensions (once, if the camera
+            # delivers a different size than requested)
             frame_height, frame_width = display_frame.shape[:2]
-            resized_svg_overlay = cv2.resize(self.svg_overlay, (frame_width, frame_height))
-            
-            # Create a mask for non-zero pixels in the SVG overlay
-            mask = np.any(resized_svg_overlay > 0, axis=2).astype(np.uint8) * 255
+            if self.svg_overlay.shape[:2] != (frame_height, frame_width):
+                self.svg_overlay = cv2.resize(self.svg_overlay, (frame_width, frame_height))
+                self.svg_overlay_mask = cv2.resize(self.svg_overlay_mask, (frame_width, frame_height),
+                                                   interpolation=cv2.INTER_NEAREST)
             
-            # Apply overlay only where mask is non-zero
-            overlay_mask = cv2.cvtColor(mask, cv2.COLOR_GRAY2BGR)
-            overlay_mask = overlay_mask / 255.0  # Normalize to 0-1 range
-            
-            # Blend frame with SVG overlay using the mask
+            # Blend frame with SVG overlay, applied only where the mask is non-zero
             alpha = 0.6  # Transparency factor for better visibility
-            display_frame = display_frame * (1 - overlay_mask * alpha) + resized_svg_overlay * overlay_mask * alpha
-            display_frame = display_frame.astype(np.uint8)
+            if self._blend_buf is None or self._blend_buf.shape != display_frame.shape:
+                self._blend_buf = np.empty_like(display_frame)
+            cv2.addWeighted(display_frame, 1 - alpha, self.svg_overlay, alpha, 0, dst=self._blend_buf)
+            cv2.copyTo(self._blend_buf, self.svg_overlay_mask, display_frame)
         
         # Add text showing touched objects
         if touched_objects:
@@ -556,53 +780,44 @@ class PoseTouchDetector:
         logger.info("Starting pose touch detection...")
         self.running = True
         
+        if not self.fake_pose:
+            self._start_pipeline_threads()
+        
+        # Fake poses have no camera to wait on; pace them against a ~30 FPS deadline
+        frame_interval = 1.0 / 30
+        next_frame_time = time.monotonic()
+        
         try:
             while self.running:
                 if self.fake_pose:
-                    # Get fake pose data
+                    delay = next_frame_time - time.monotonic()
+                    if delay > 0:
+                        time.sleep(delay)
+                    next_frame_time = max(next_frame_time + frame_interval, time.monotonic())
+                    
+                    # Get fake pose data (the fake streamer never produces a frame image)
                     frame, pose_data = self.pose_streamer.get_frame()
-                    if frame is None:
-                        time.sleep(0.03)  # ~30 FPS
+                    if pose_data is None:
                         continue
                     
                     # Process pose data directly
                     touched_objects = self._process_fake_pose_data(pose_data)
-                else:
-                    # Get frame from camera or video file
-                    ret, frame = self.cap.read()
-                    if not ret:
-                        if hasattr(self, 'is_video_file') and self.is_video_file:
-                            if self.loop:
-                                logger.info("Restarting video from beginning...")
-                                self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
-                                continue
-                            else:
-                                logger.info("End of video file. Exiting...")
-                                break
-                        else:
-                            logger.warning("Failed to read frame from camera")
-                            time.sleep(0.1)
-                            continue
                     
-                    # Apply orientation correction if needed
-                    corrected_frame = self._apply_orientation_correction(frame)
+                    # Stream touched objects
+                    self.stream_touched_objects(touched_objects)
                     
-                    # Detect touches
-                    touched_objects, annotated_frame = self.detect_touches(corrected_frame)
-                
-                # Stream touched objects
-                self.stream_touched_objects(touched_objects)
-                
-                # Display frame with visualizations
-                if not self.fake_pose:
+                    # Debug output
+                    if self.debug and touched_objects:
+                        logger.info("Touched objects: {}", touched_objects)
+                else:
+                    # Capture and inference run on their own threads; only display here
+                    try:
+                        annotated_frame, touched_objects = self._result_q.get(timeout=0.1)
+                    except queue.Empty:
+                        continue
+                    
+                    # Display frame with visualizations
                     self._display_frame(annotated_frame, touched_objects)
-                
-                # Debug output
-                if self.debug and touched_objects:
-                    logger.info(f"Touched objects: {touched_objects}")
-                
-                # Small delay to prevent excessive CPU usage
-                time.sleep(0.01)
         
         except KeyboardInterrupt:
             logger.info("Interrupted by user")
@@ -650,18 +865,110 @@ class PoseTouchDetector:
         logger.info("Cleaning up...")
         self.running = False
         
+        for thread in (self._capture_thread, self._inference_thread):
+            if thread is not None and thread is not threading.current_thread():
+                thread.join(timeout=1.0)
+        
         if self.cap and self.cap.isOpened():
             self.cap.release()
         
+        self._stop_send_loop()
+        
         # Close OpenCV windows if they were opened
         if self.show_video:
             cv2.destroyAllWindows()
         
         self.pose.close()
-        self.hands.close()
         
         logger.info("Cleanup complete")
     
+    @staticmethod
+    def _put_latest(q, item):
+        """Put into a single-slot queue, replacing whatever is waiting there."""
+        try:
+            q.put_nowait(item)
+        except queue.Full:
+            try:
+                q.get_nowait()
+            except queue.Empty:
+                pass
+            q.put_nowait(item)
+    
+    def _capture_loop(self):
+        """
+        Read frames from the camera or video file on a dedicated thread.
+        
+        Live camera frames replace any frame the worker has not picked up yet,
+        since backends such as FFMPEG/RTSP ignore CAP_PROP_BUFFERSIZE. Video
+        file frames are handed over without dropping; None marks the end.
+        """
+        while self.running:
+            ret, frame = self.cap.read()
+            if not ret:
+                if self.is_video_file:
+                    if self.loop:
+                        logger.info("Restarting video from beginning...")
+                        self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                        continue
+                    logger.info("End of video file. Exiting...")
+                    frame = None
+                else:
+                    logger.warning("Failed to read frame from camera")
+                    time.sleep(0.1)
+                    continue
+            
+            if not self.is_video_file:
+                self._put_latest(self._frame_q, frame)
+                continue
+            
+            # Block until the worker is ready, but keep checking for shutdown
+            while self.running:
+                try:
+                    self._frame_q.put(frame, timeout=0.1)
+                    break
+                except queue.Full:
+                    continue
+            if frame is None:
+                return
+    
+    def _inference_loop(self):
+        """Run pose inference and touch detection on frames from the capture thread."""
+        try:
+            while self.running:
+                try:
+                    frame = self._frame_q.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                if frame is None:
+                    self.running = False
+                    break
+                
+                # Apply orientation correction if needed
+                corrected_frame = self._apply_orientation_correction(frame)
+                
+                # Detect touches
+                touched_objects, annotated_frame = self.detect_touches(corrected_frame)
+                
+                # Stream touched objects
+                self.stream_touched_objects(touched_objects)
+                
+                # Debug output
+                if self.debug and touched_objects:
+                    logger.info("Touched objects: {}", touched_objects)
+                
+                if self.show_video:
+                    self._put_latest(self._result_q, (annotated_frame, touched_objects))
+        except Exception as e:
+            logger.error(f"Error in inference loop: {e}")
+            self.running = False
+    
+    def _start_pipeline_threads(self):
+        """Start the capture and inference threads."""
+        self._capture_thread = threading.Thread(target=self._capture_loop, daemon=True)
+        self._inference_thread = threading.Thread(target=self._inference_loop, daemon=True)
+        self._capture_thread.start()
+        self._inference_thread.start()
+    
     def _apply_orientation_correction(self, frame):
         """
         Apply orientation correction to frame based on detected video orientation.
@@ -692,7 +999,7 @@ class PoseTouchDetector:
         elif self.needs_resize:
             # For .mp4 files with SAR, resize to correct portrait dimensions
             corrected_frame = cv2.resize(frame, (int(self.display_width), int(self.display_height)))
-            logger.debug(f"Resized frame to {int(self.display_width)}x{int(self.display_height)}")
+            logger.debug("Resized frame to {}x{}", int(self.display_width), int(self.display_height))
         else:
             # No correction needed
             corrected_frame = frame
@@ -762,6 +1069,23 @@ class Command(BaseCommand):
             action='store_true',
             help='Display SVG holds overlay on video'
         )
+        parser.add_argument(
+            '--model-complexity',
+            type=int,
+            choices=[0, 1, 2],
+            default=0,
+            help='MediaPipe pose model complexity (0 = lite/fastest, 1 = full, 2 = heavy)'
+        )
+        parser.add_argument(
+            '--pose-model',
+            type=str,
+            help='Path to a MediaPipe Tasks pose landmarker .task model (enables the Tasks API)'
+        )
+        parser.add_argument(
+            '--gpu',
+            action='store_true',
+            help='Run the Tasks API pose landmarker on the GPU delegate (requires --pose-model)'
+        )
     
     def handle(self, *args, **options):
         # Configure logging
@@ -789,7 +1113,10 @@ class Command(BaseCommand):
             debug=options['debug'],
             show_video=options['show_video'],
             show_skeleton=options['show_skeleton'],
-            show_svg=options['show_svg']
+            show_svg=options['show_svg'],
+            model_complexity=options['model_complexity'],
+            pose_model=options.get('pose_model'),
+            gpu=options['gpu']
         )
         
         detector.run()
\ No newline at end of file
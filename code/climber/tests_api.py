@@ -1,7 +1,8 @@
+from unittest.mock import patch
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
-from .models import Group, Venue, Route # Import some models to test
+from .models import Group, Venue, Route, Wall, CeleryTask # Import some models to test
 
 # It's good practice to create some test data, but for this initial check,
 # we'll just ensure the endpoints are registered and return 200 or 404 if no data.
@@ -33,6 +34,68 @@ class RouteAPITests(APITestCase):
         response = self.client.get(url, format='json')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
+class StartDefaultTaskAPITests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        venue = Venue.objects.create(name="Test Venue")
+        cls.wall = Wall.objects.create(name="Test Wall", venue=venue)
+        cls.route = Route.objects.create(name="Test Route")
+
+    @patch('climber.views.websocket_pose_session_tracker_task')
+    def test_start_default_task(self, mock_task):
+        """
+        Ensure a tracker task is started for the route on the first wall.
+        """
+        mock_task.delay.return_value.id = 'test-task-id-123'
+        url = reverse('start_default_task')
+        response = self.client.post(url, {'route_id': self.route.id}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['task_id'], 'test-task-id-123')
+        task_kwargs = mock_task.delay.call_args.kwargs
+        self.assertEqual(task_kwargs['route_id'], self.route.id)
+        self.assertEqual(task_kwargs['wall_id'], self.wall.id)
+
+    def test_start_default_task_without_route_id(self):
+        """
+        Ensure route_id is required.
+        """
+        url = reverse('start_default_task')
+        response = self.client.post(url, {}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('route_id is required', response.json()['message'])
+
+    def test_start_default_task_without_walls(self):
+        """
+        Ensure a missing wall is reported instead of starting a task.
+        """
+        Wall.objects.all().delete()
+        url = reverse('start_default_task')
+        response = self.client.post(url, {'route_id': self.route.id}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('No walls available', response.json()['message'])
+
+class KillAllTasksAPITests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        CeleryTask.objects.bulk_create([
+            CeleryTask(task_id='test-task-1', task_name='test_task_1', status='PENDING'),
+            CeleryTask(task_id='test-task-2', task_name='test_task_2', status='PROGRESS'),
+        ])
+
+    @patch('websockets.connect', side_effect=OSError)
+    @patch('celery.result.AsyncResult')
+    def test_kill_all_tasks(self, mock_async_result, mock_connect):
+        """
+        Ensure all running tasks are revoked and marked as such.
+        """
+        mock_async_result.return_value.state = 'PENDING'
+        url = reverse('kill_all_tasks')
+        response = self.client.post(url, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['killed_count'], 2)
+        self.assertEqual(mock_async_result.return_value.revoke.call_count, 2)
+        self.assertFalse(CeleryTask.objects.exclude(status='REVOKED').exists())
+
 # TODO: Add tests for other models (AppUser, Wall, Hold)
 # TODO: Add tests for create, retrieve, update, delete operations
 # TODO: Add tests for permissions if they become more complex
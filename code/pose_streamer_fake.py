@@ -6,6 +6,12 @@ import random
 import time
 
 import websockets
+from websockets.exceptions import ConnectionClosed, ConnectionClosedError
+
+try:
+    from picows import WSListener, WSMsgType, ws_connect
+except ImportError:
+    ws_connect = None
 
 
 def parse_args() -> argparse.Namespace:
@@ -54,10 +60,18 @@ class ClimbController:
     - Other limbs remain planted with micro-jitter
     """
 
+    # Vertical reach window (min_dy, max_dy) above the current hold
+    HAND_REACH = (0.12, 0.25)  # Reach hands higher than current hand height
+    FOOT_REACH = (0.08, 0.18)  # Feet step up smaller amount
+
     def __init__(self, rng: random.Random | None = None):
         self.rng = rng or random
         self.wall_z = 0.14
-        self.holds = self._generate_holds()
+        # The hold grid never changes after construction, so destination candidates
+        # for every source hold are precomputed once
+        self.holds: tuple[tuple[float, float, float], ...] = tuple(self._generate_holds())
+        self._hand_above = self._candidates_above(*self.HAND_REACH)
+        self._foot_above = self._candidates_above(*self.FOOT_REACH)
 
         # Limb indices and order
         self.order = ["RH", "LH", "RF", "LF"]
@@ -106,12 +120,20 @@ class ClimbController:
                 best_i = i
         return best_i
 
-    def _candidate_hold_above(self, ref_x: float, ref_y: float, min_dy: float, max_dy: float) -> int:
-        candidates: list[int] = []
-        for i, (hx, hy, _) in enumerate(self.holds):
-            if hy > ref_y + min_dy and hy < ref_y + max_dy and abs(hx - ref_x) < 0.35:
-                candidates.append(i)
+    def _candidates_above(self, min_dy: float, max_dy: float) -> tuple[tuple[int, ...], ...]:
+        """For each hold, the indices of holds within the reach window above it."""
+        return tuple(
+            tuple(
+                i
+                for i, (hx, hy, _) in enumerate(self.holds)
+                if hy > ref_y + min_dy and hy < ref_y + max_dy and abs(hx - ref_x) < 0.35
+            )
+            for ref_x, ref_y, _ in self.holds
+        )
+
+    def _candidate_hold_above(self, src_index: int, candidates: tuple[int, ...], max_dy: float) -> int:
         if not candidates:
+            ref_x, ref_y, _ = self.holds[src_index]
             return self._nearest_hold(ref_x + self.rng.uniform(-0.2, 0.2), ref_y + max_dy)
         return self.rng.choice(candidates)
 
@@ -122,19 +144,18 @@ class ClimbController:
     def _start_move(self, limb: str, frame_index: int) -> None:
         self.active_limb = limb
         self.move_start_frame = frame_index
-        sx, sy, sz = self._limb_pos(limb)
-        self.src_pos = (sx, sy, sz)
+        src_index = self.limb_to_hold[limb]
+        self.src_pos = self.holds[src_index]
 
         # Choose destination hold
         if limb in ("LH", "RH"):
-            # Reach hands higher than current hand height
-            min_dy, max_dy = 0.12, 0.25
+            candidates = self._hand_above[src_index]
+            max_dy = self.HAND_REACH[1]
         else:
-            # Feet step up smaller amount
-            min_dy, max_dy = 0.08, 0.18
+            candidates = self._foot_above[src_index]
+            max_dy = self.FOOT_REACH[1]
 
-        # Reference x from current limb, allow a little lateral variation
-        dst_index = self._candidate_hold_above(sx, sy, min_dy=min_dy, max_dy=max_dy)
+        dst_index = self._candidate_hold_above(src_index, candidates, max_dy)
         dx, dy, dz = self.holds[dst_index]
         self.dst_pos = (dx, dy, dz)
 
@@ -193,131 +214,106 @@ class ClimbController:
 # Persistent controller instance
 _CLIMB_CTRL: ClimbController | None = None
 
-def generate_fake_landmarks(
-    frame_index: int,
-    num_landmarks: int,
-    mode: str,
-) -> list[dict]:
-    """Generate anatomically plausible MediaPipe Pose landmarks (33 points).
-
-    The skeleton is built from simple segment lengths and animated with a
-    lightweight gait/idle model. Coordinates are in meters-ish, with
-    x (right), y (up), z (forward).
-    """
-
-    # MediaPipe Pose landmark indices (subset of names for clarity)
-    NOSE = 0
-    LEFT_EYE_INNER = 1
-    LEFT_EYE = 2
-    LEFT_EYE_OUTER = 3
-    RIGHT_EYE_INNER = 4
-    RIGHT_EYE = 5
-    RIGHT_EYE_OUTER = 6
-    LEFT_EAR = 7
-    RIGHT_EAR = 8
-    MOUTH_LEFT = 9
-    MOUTH_RIGHT = 10
-    LEFT_SHOULDER = 11
-    RIGHT_SHOULDER = 12
-    LEFT_ELBOW = 13
-    RIGHT_ELBOW = 14
-    LEFT_WRIST = 15
-    RIGHT_WRIST = 16
-    LEFT_PINKY = 17
-    RIGHT_PINKY = 18
-    LEFT_INDEX = 19
-    RIGHT_INDEX = 20
-    LEFT_THUMB = 21
-    RIGHT_THUMB = 22
-    LEFT_HIP = 23
-    RIGHT_HIP = 24
-    LEFT_KNEE = 25
-    RIGHT_KNEE = 26
-    LEFT_ANKLE = 27
-    RIGHT_ANKLE = 28
-    LEFT_HEEL = 29
-    RIGHT_HEEL = 30
-    LEFT_FOOT_INDEX = 31
-    RIGHT_FOOT_INDEX = 32
-
-    # Segment lengths (meters) and widths
-    shoulder_width = 0.36
-    hip_width = 0.30
-    torso_height = 0.55
-    neck_length = 0.10
-    head_radius = 0.09
-    upper_arm = 0.28
-    lower_arm = 0.26
-    hand_len = 0.10
-    upper_leg = 0.45
-    lower_leg = 0.45
-    foot_len = 0.24
-
-    # Animation parameters
-    t = frame_index / 60.0
-    omega = 2.0 * math.pi * 0.7  # step frequency ~0.7 Hz
-    stride = 0.25
-    sway_amp = 0.03
-    bob_amp = 0.04
-
-    # Interpret modes: "sine" behaves like a walk cycle; "idle" gentle sway; "climb" slower cadence
-    if mode == "idle":
-        omega = 2.0 * math.pi * 0.25
-        stride = 0.0
-        bob_amp = 0.01
-    elif mode == "climb":
-        omega = 2.0 * math.pi * 0.4
-        stride = 0.0
-        sway_amp = 0.015
-        bob_amp = 0.02
-
-    # Pelvis center (mid-hip). Small bob and lateral sway.
-    pelvis_y_base = 1.0
-    if mode == "climb":
-        # Climbing: pelvis stays at fixed height, just sways for balance
-        bob = bob_amp * math.sin(2.0 * omega * t) * 0.3
-        sway = sway_amp * math.sin(omega * t * 0.7) * 0.8
-        pelvis_center = (0.0 + sway, pelvis_y_base + bob, 0.02)
-    else:
-        bob = bob_amp * math.sin(2.0 * omega * t)
-        sway = sway_amp * math.sin(omega * t)
-        pelvis_center = (0.0 + sway, pelvis_y_base + bob, 0.0)
-
-    # Helper to add small noise, keeping stability
-    def jitter(scale: float = 0.01) -> float:
-        return random.uniform(-scale, scale)
-
-    # Initialize output array
-    points: list[dict | None] = [None] * 33
-
-    def set_point(idx: int, x: float, y: float, z: float, vis: float = 0.95) -> None:
-        points[idx] = {
-            "x": x,
-            "y": y,
-            "z": z,
-            "visibility": max(0.0, min(1.0, vis + jitter(0.02))),
-        }
-
+# MediaPipe Pose landmark indices (subset of names for clarity)
+NOSE = 0
+LEFT_EYE_INNER = 1
+LEFT_EYE = 2
+LEFT_EYE_OUTER = 3
+RIGHT_EYE_INNER = 4
+RIGHT_EYE = 5
+RIGHT_EYE_OUTER = 6
+LEFT_EAR = 7
+RIGHT_EAR = 8
+MOUTH_LEFT = 9
+MOUTH_RIGHT = 10
+LEFT_SHOULDER = 11
+RIGHT_SHOULDER = 12
+LEFT_ELBOW = 13
+RIGHT_ELBOW = 14
+LEFT_WRIST = 15
+RIGHT_WRIST = 16
+LEFT_PINKY = 17
+RIGHT_PINKY = 18
+LEFT_INDEX = 19
+RIGHT_INDEX = 20
+LEFT_THUMB = 21
+RIGHT_THUMB = 22
+LEFT_HIP = 23
+RIGHT_HIP = 24
+LEFT_KNEE = 25
+RIGHT_KNEE = 26
+LEFT_ANKLE = 27
+RIGHT_ANKLE = 28
+LEFT_HEEL = 29
+RIGHT_HEEL = 30
+LEFT_FOOT_INDEX = 31
+RIGHT_FOOT_INDEX = 32
+
+# Segment lengths (meters) and widths
+SHOULDER_WIDTH = 0.36
+HIP_WIDTH = 0.30
+TORSO_HEIGHT = 0.55
+NECK_LENGTH = 0.10
+HEAD_RADIUS = 0.09
+UPPER_ARM = 0.28
+LOWER_ARM = 0.26
+HAND_LEN = 0.10
+UPPER_LEG = 0.45
+LOWER_LEG = 0.45
+FOOT_LEN = 0.24
+
+PELVIS_Y_BASE = 1.0
+
+# Gait frequencies per mode (rad/s)
+_WALK_OMEGA = 2.0 * math.pi * 0.7  # step frequency ~0.7 Hz
+_IDLE_OMEGA = 2.0 * math.pi * 0.25
+_CLIMB_OMEGA = 2.0 * math.pi * 0.4
+
+# Landmark dicts reused across frames; the generators below overwrite them in place.
+# Callers consume a frame (serialize / convert) before requesting the next one.
+_POINTS: list[dict] = [{"x": 0.0, "y": 0.0, "z": 0.0, "visibility": 0.0} for _ in range(33)]
+
+
+# Helper to add small noise, keeping stability
+def _jitter(scale: float = 0.01) -> float:
+    return random.uniform(-scale, scale)
+
+
+def _set_point(idx: int, x: float, y: float, z: float, vis: float = 0.95) -> None:
+    p = _POINTS[idx]
+    p["x"] = x
+    p["y"] = y
+    p["z"] = z
+    p["visibility"] = max(0.0, min(1.0, vis + _jitter(0.02)))
+
+
+def _set_point_random(idx: int, x: float, y: float, z: float, vis: float = 0.95) -> None:
+    # "random" mode adds extra positional jitter as each point is written
+    _set_point(idx, x + _jitter(0.04), y + _jitter(0.04), z + _jitter(0.04), vis)
+
+
+def _set_torso_and_head(pelvis_center: tuple[float, float, float], set_point) -> tuple:
+    """Write hips, shoulders and face landmarks; returns (lhip, rhip, lsh, rsh)."""
     # Hips (left/right)
-    lx = -hip_width / 2.0
-    rx = hip_width / 2.0
+    lx = -HIP_WIDTH / 2.0
+    rx = HIP_WIDTH / 2.0
     lhip = (pelvis_center[0] + lx, pelvis_center[1], pelvis_center[2])
     rhip = (pelvis_center[0] + rx, pelvis_center[1], pelvis_center[2])
     set_point(LEFT_HIP, *lhip)
     set_point(RIGHT_HIP, *rhip)
 
     # Shoulders relative to pelvis
-    shoulder_y = pelvis_center[1] + torso_height
-    lsh = (pelvis_center[0] - shoulder_width / 2.0, shoulder_y, pelvis_center[2])
-    rsh = (pelvis_center[0] + shoulder_width / 2.0, shoulder_y, pelvis_center[2])
+    shoulder_y = pelvis_center[1] + TORSO_HEIGHT
+    lsh = (pelvis_center[0] - SHOULDER_WIDTH / 2.0, shoulder_y, pelvis_center[2])
+    rsh = (pelvis_center[0] + SHOULDER_WIDTH / 2.0, shoulder_y, pelvis_center[2])
     set_point(LEFT_SHOULDER, *lsh)
     set_point(RIGHT_SHOULDER, *rsh)
 
     # Neck and head
-    neck = (pelvis_center[0], shoulder_y + neck_length, pelvis_center[2])
-    head_center = (neck[0], neck[1] + head_radius * 1.2, neck[2])
-    nose = (head_center[0], head_center[1], head_center[2] + head_radius * 0.8)
-    set_point(NOSE, nose[0] + jitter(0.005), nose[1] + jitter(0.005), nose[2] + jitter(0.005))
+    neck = (pelvis_center[0], shoulder_y + NECK_LENGTH, pelvis_center[2])
+    head_center = (neck[0], neck[1] + HEAD_RADIUS * 1.2, neck[2])
+    nose = (head_center[0], head_center[1], head_center[2] + HEAD_RADIUS * 0.8)
+    set_point(NOSE, nose[0] + _jitter(0.005), nose[1] + _jitter(0.005), nose[2] + _jitter(0.005))
 
     eye_off_y = 0.02
     eye_off_x = 0.03
@@ -340,202 +336,307 @@ def generate_fake_landmarks(
     set_point(MOUTH_LEFT, head_center[0] - mouth_off_x, head_center[1] + mouth_off_y, head_center[2] + mouth_off_z)
     set_point(MOUTH_RIGHT, head_center[0] + mouth_off_x, head_center[1] + mouth_off_y, head_center[2] + mouth_off_z)
 
-    if mode == "climb":
-        # Use climbing controller for realistic limb placements on wall holds
-        global _CLIMB_CTRL
-        if _CLIMB_CTRL is None:
-            _CLIMB_CTRL = ClimbController()
-        limb_positions = _CLIMB_CTRL.update(frame_index)
-
-        # Torso lean toward wall and slight bias to active hand
-        torso_lean_z = 0.05
-        active_bias = 0.0
-        if _CLIMB_CTRL.active_limb in ("LH", "RH"):
-            active_bias = -0.03 if _CLIMB_CTRL.active_limb == "LH" else 0.03
-        lsh = (lsh[0] - active_bias, lsh[1], lsh[2] + torso_lean_z)
-        rsh = (rsh[0] + active_bias, rsh[1], rsh[2] + torso_lean_z)
-        lhip = (lhip[0] - active_bias * 0.5, lhip[1], lhip[2] + torso_lean_z * 0.4)
-        rhip = (rhip[0] + active_bias * 0.5, rhip[1], rhip[2] + torso_lean_z * 0.4)
-
-        # Hands to holds and elbows bent toward shoulders
-        lwrist = limb_positions["LH"]
-        rwrist = limb_positions["RH"]
-        lelbow = ((lsh[0] + lwrist[0]) * 0.5, (lsh[1] + lwrist[1]) * 0.5, (lsh[2] + lwrist[2]) * 0.5)
-        relbow = ((rsh[0] + rwrist[0]) * 0.5, (rsh[1] + rwrist[1]) * 0.5, (rsh[2] + rwrist[2]) * 0.5)
-        set_point(LEFT_ELBOW, *lelbow)
-        set_point(RIGHT_ELBOW, *relbow)
-        set_point(LEFT_WRIST, *lwrist)
-        set_point(RIGHT_WRIST, *rwrist)
-
-        # Feet to holds and knees slightly bent forward
-        lankle = limb_positions["LF"]
-        rankle = limb_positions["RF"]
-        lknee = ((lhip[0] + lankle[0]) * 0.5, (lhip[1] + lankle[1]) * 0.6, (lhip[2] + lankle[2]) * 0.5)
-        rknee = ((rhip[0] + rankle[0]) * 0.5, (rhip[1] + rankle[1]) * 0.6, (rhip[2] + rankle[2]) * 0.5)
-        set_point(LEFT_KNEE, *lknee)
-        set_point(RIGHT_KNEE, *rknee)
-        set_point(LEFT_ANKLE, *lankle)
-        set_point(RIGHT_ANKLE, *rankle)
-
-        # Feet pressing the wall
-        lheel = (lankle[0], lankle[1] - 0.02, lankle[2] - foot_len * 0.15)
-        rheel = (rankle[0], rankle[1] - 0.02, rankle[2] - foot_len * 0.15)
-        ltoe = (lankle[0], lankle[1] - 0.005, lankle[2] + foot_len * 0.5)
-        rtoe = (rankle[0], rankle[1] - 0.005, rankle[2] + foot_len * 0.5)
-        set_point(LEFT_HEEL, *lheel)
-        set_point(RIGHT_HEEL, *rheel)
-        set_point(LEFT_FOOT_INDEX, *ltoe)
-        set_point(RIGHT_FOOT_INDEX, *rtoe)
-
-        # Finger approximations on the wall
-        def hand_points_wall(wrist: tuple[float, float, float], side_sign: float) -> tuple[tuple[float, float, float], tuple[float, float, float], tuple[float, float, float]]:
-            index_pt = (wrist[0] + side_sign * 0.015, wrist[1] - 0.01, wrist[2] + 0.005)
-            pinky_pt = (wrist[0] - side_sign * 0.015, wrist[1] - 0.01, wrist[2] + 0.005)
-            thumb_pt = (wrist[0] + side_sign * 0.02, wrist[1] - 0.005, wrist[2] - 0.005)
-            return index_pt, pinky_pt, thumb_pt
-
-        l_index, l_pinky, l_thumb = hand_points_wall(lwrist, -1.0)
-        r_index, r_pinky, r_thumb = hand_points_wall(rwrist, 1.0)
-        set_point(LEFT_INDEX, *l_index)
-        set_point(LEFT_PINKY, *l_pinky)
-        set_point(LEFT_THUMB, *l_thumb)
-        set_point(RIGHT_INDEX, *r_index)
-        set_point(RIGHT_PINKY, *r_pinky)
-        set_point(RIGHT_THUMB, *r_thumb)
-    else:
-        # Default walk/idle/sine/random behavior
-        def leg_chain(hip: tuple[float, float, float], phase: float) -> tuple[tuple[float, float, float], tuple[float, float, float], tuple[float, float, float]]:
-            s = math.sin(omega * t + phase)
-            c = math.cos(omega * t + phase)
-            z_off = stride * s
-            knee_y = hip[1] - upper_leg + 0.05 * (1.0 - c)
-            knee_z = hip[2] + z_off * 0.5
-            ankle_y = knee_y - lower_leg + 0.03 * (1.0 - math.cos(omega * t * 2.0 + phase))
-            ankle_z = hip[2] + z_off
-            return (knee_y, knee_z), (ankle_y, ankle_z), (z_off,)
-
-        (l_knee_y, l_knee_z), (l_ankle_y, l_ankle_z), _ = leg_chain(lhip, 0.0)
-        (r_knee_y, r_knee_z), (r_ankle_y, r_ankle_z), _ = leg_chain(rhip, math.pi)
-
-        lknee = (lhip[0], l_knee_y, l_knee_z)
-        rknee = (rhip[0], r_knee_y, r_knee_z)
-        lankle = (lhip[0], l_ankle_y, l_ankle_z)
-        rankle = (rhip[0], r_ankle_y, r_ankle_z)
-
-        set_point(LEFT_KNEE, *lknee)
-        set_point(RIGHT_KNEE, *rknee)
-        set_point(LEFT_ANKLE, *lankle)
-        set_point(RIGHT_ANKLE, *rankle)
-
-        lheel = (lankle[0], lankle[1] - 0.02, lankle[2] - foot_len * 0.3)
-        rheel = (rankle[0], rankle[1] - 0.02, rankle[2] - foot_len * 0.3)
-        ltoe = (lankle[0], lankle[1] - 0.01, lankle[2] + foot_len)
-        rtoe = (rankle[0], rankle[1] - 0.01, rankle[2] + foot_len)
-        set_point(LEFT_HEEL, *lheel)
-        set_point(RIGHT_HEEL, *rheel)
-        set_point(LEFT_FOOT_INDEX, *ltoe)
-        set_point(RIGHT_FOOT_INDEX, *rtoe)
-
-        def arm_chain(shoulder: tuple[float, float, float], opposite_leg_phase: float, side_sign: float) -> tuple[tuple[float, float, float], tuple[float, float, float]]:
-            s = math.sin(omega * t + opposite_leg_phase)
-            z_off = -0.6 * stride * s
-            elbow_y = shoulder[1] - upper_arm + 0.02 * (1.0 - math.cos(omega * t * 1.5 + opposite_leg_phase))
-            elbow_z = shoulder[2] + z_off * 0.5
-            wrist_y = elbow_y - lower_arm
-            wrist_z = shoulder[2] + z_off
-            elbow_x = shoulder[0] + side_sign * 0.03
-            wrist_x = shoulder[0] + side_sign * 0.05
-            return (elbow_x, elbow_y, elbow_z), (wrist_x, wrist_y, wrist_z)
-
-        lelbow, lwrist = arm_chain(lsh, math.pi, -1.0)
-        relbow, rwrist = arm_chain(rsh, 0.0, 1.0)
-        set_point(LEFT_ELBOW, *lelbow)
-        set_point(RIGHT_ELBOW, *relbow)
-        set_point(LEFT_WRIST, *lwrist)
-        set_point(RIGHT_WRIST, *rwrist)
-
-        def hand_points(wrist: tuple[float, float, float], side_sign: float) -> tuple[tuple[float, float, float], tuple[float, float, float], tuple[float, float, float]]:
-            index_pt = (wrist[0] + side_sign * 0.02, wrist[1] - 0.02, wrist[2] + hand_len)
-            pinky_pt = (wrist[0] - side_sign * 0.02, wrist[1] - 0.02, wrist[2] + hand_len * 0.9)
-            thumb_pt = (wrist[0] + side_sign * 0.03, wrist[1] - 0.01, wrist[2] + hand_len * 0.5)
-            return index_pt, pinky_pt, thumb_pt
-
-        l_index, l_pinky, l_thumb = hand_points(lwrist, -1.0)
-        r_index, r_pinky, r_thumb = hand_points(rwrist, 1.0)
-        set_point(LEFT_INDEX, *l_index)
-        set_point(LEFT_PINKY, *l_pinky)
-        set_point(LEFT_THUMB, *l_thumb)
-        set_point(RIGHT_INDEX, *r_index)
-        set_point(RIGHT_PINKY, *r_pinky)
-        set_point(RIGHT_THUMB, *r_thumb)
-
-    # Apply extra jitter for "random" mode
-    if mode == "random":
-        for i, p in enumerate(points):
-            if p is None:
-                continue
-            p["x"] += jitter(0.04)
-            p["y"] += jitter(0.04)
-            p["z"] += jitter(0.04)
-
-    # Fill any remaining points with reasonable fallbacks (shouldn't happen)
-    for i in range(len(points)):
-        if points[i] is None:
-            points[i] = {
-                "x": pelvis_center[0] + jitter(0.01),
-                "y": pelvis_center[1] + jitter(0.01),
-                "z": pelvis_center[2] + jitter(0.01),
-                "visibility": 0.9,
-            }
-
-    # Re-center around pelvis and flip Y so the viewer (which negates axes) shows upright pose.
-    cx, cy, cz = pelvis_center
-    for p in points:
-        if p is None:
-            continue
-        p["x"] = p["x"] - cx
-        p["y"] = -(p["y"] - cy)
-        p["z"] = p["z"] - cz
-
-    # Calculate the actual pose bounds
-    min_x = min(p["x"] for p in points if p is not None)
-    max_x = max(p["x"] for p in points if p is not None)
-    min_y = min(p["y"] for p in points if p is not None)
-    max_y = max(p["y"] for p in points if p is not None)
-    
-    # Calculate the range
-    range_x = max_x - min_x
-    range_y = max_y - min_y
-    
-    # For climbing mode, add movement around the canvas
-    if mode == "climb":
-        # Calculate a moving offset that changes slowly over time
-        t = frame_index / 300.0  # Complete a cycle every 5 seconds at 60fps
-        offset_x = 0.15 * math.sin(t)  # Horizontal movement
-        offset_y = 0.1 * math.sin(t * 1.3)  # Vertical movement with different frequency
-    else:
-        offset_x = 0.0
-        offset_y = 0.0
-    
-    # Scale the pose to be about 1/3 of canvas height
-    # We want the pose height to be about 0.33 of the canvas height
+    return lhip, rhip, lsh, rsh
+
+
+def _finish_pose(pelvis_center: tuple[float, float, float], offset_x: float, offset_y: float) -> list[dict]:
+    """Single pass: re-center around pelvis, flip Y so the viewer (which negates axes)
+    shows an upright pose, and scale the pose to be about 1/3 of canvas height."""
+    points = _POINTS
+    # The Y range is unaffected by the re-center/flip, so measure it on the raw points
+    ys = [p["y"] for p in points]
+    range_y = max(ys) - min(ys)
+
     target_height = 0.33
     scale_factor = target_height / range_y
-    
-    # Apply scaling and center the pose in the middle portion of the canvas
+
+    # Center the pose in the middle portion of the canvas
     center_x = 0.5 + offset_x  # Center with horizontal offset
     center_y = 0.5 + offset_y  # Center with vertical offset
-    
+
+    cx, cy, cz = pelvis_center
     for p in points:
-        if p is None:
-            continue
-        # Scale the coordinates
-        p["x"] = p["x"] * scale_factor + center_x
-        p["y"] = p["y"] * scale_factor + center_y
-        # Keep z as is (depth information)
+        p["x"] = (p["x"] - cx) * scale_factor + center_x
+        p["y"] = (cy - p["y"]) * scale_factor + center_y
+        p["z"] = p["z"] - cz  # Keep z unscaled (depth information)
+
+    return points
+
+
+def _walk_pose(frame_index: int, omega: float, stride: float, sway_amp: float, bob_amp: float, set_point) -> list[dict]:
+    """Walk/idle/sine/random skeleton driven by a simple gait cycle."""
+    t = frame_index / 60.0
 
+    # Pelvis center (mid-hip). Small bob and lateral sway.
+    bob = bob_amp * math.sin(2.0 * omega * t)
+    sway = sway_amp * math.sin(omega * t)
+    pelvis_center = (0.0 + sway, PELVIS_Y_BASE + bob, 0.0)
+
+    lhip, rhip, lsh, rsh = _set_torso_and_head(pelvis_center, set_point)
+
+    def leg_chain(hip: tuple[float, float, float], phase: float) -> tuple[tuple[float, float, float], tuple[float, float, float], tuple[float, float, float]]:
+        s = math.sin(omega * t + phase)
+        c = math.cos(omega * t + phase)
+        z_off = stride * s
+        knee_y = hip[1] - UPPER_LEG + 0.05 * (1.0 - c)
+        knee_z = hip[2] + z_off * 0.5
+        ankle_y = knee_y - LOWER_LEG + 0.03 * (1.0 - math.cos(omega * t * 2.0 + phase))
+        ankle_z = hip[2] + z_off
+        return (knee_y, knee_z), (ankle_y, ankle_z), (z_off,)
+
+    (l_knee_y, l_knee_z), (l_ankle_y, l_ankle_z), _ = leg_chain(lhip, 0.0)
+    (r_knee_y, r_knee_z), (r_ankle_y, r_ankle_z), _ = leg_chain(rhip, math.pi)
+
+    lknee = (lhip[0], l_knee_y, l_knee_z)
+    rknee = (rhip[0], r_knee_y, r_knee_z)
+    lankle = (lhip[0], l_ankle_y, l_ankle_z)
+    rankle = (rhip[0], r_ankle_y, r_ankle_z)
+
+    set_point(LEFT_KNEE, *lknee)
+    set_point(RIGHT_KNEE, *rknee)
+    set_point(LEFT_ANKLE, *lankle)
+    set_point(RIGHT_ANKLE, *rankle)
+
+    lheel = (lankle[0], lankle[1] - 0.02, lankle[2] - FOOT_LEN * 0.3)
+    rheel = (rankle[0], rankle[1] - 0.02, rankle[2] - FOOT_LEN * 0.3)
+    ltoe = (lankle[0], lankle[1] - 0.01, lankle[2] + FOOT_LEN)
+    rtoe = (rankle[0], rankle[1] - 0.01, rankle[2] + FOOT_LEN)
+    set_point(LEFT_HEEL, *lheel)
+    set_point(RIGHT_HEEL, *rheel)
+    set_point(LEFT_FOOT_INDEX, *ltoe)
+    set_point(RIGHT_FOOT_INDEX, *rtoe)
+
+    def arm_chain(shoulder: tuple[float, float, float], opposite_leg_phase: float, side_sign: float) -> tuple[tuple[float, float, float], tuple[float, float, float]]:
+        s = math.sin(omega * t + opposite_leg_phase)
+        z_off = -0.6 * stride * s
+        elbow_y = shoulder[1] - UPPER_ARM + 0.02 * (1.0 - math.cos(omega * t * 1.5 + opposite_leg_phase))
+        elbow_z = shoulder[2] + z_off * 0.5
+        wrist_y = elbow_y - LOWER_ARM
+        wrist_z = shoulder[2] + z_off
+        elbow_x = shoulder[0] + side_sign * 0.03
+        wrist_x = shoulder[0] + side_sign * 0.05
+        return (elbow_x, elbow_y, elbow_z), (wrist_x, wrist_y, wrist_z)
+
+    lelbow, lwrist = arm_chain(lsh, math.pi, -1.0)
+    relbow, rwrist = arm_chain(rsh, 0.0, 1.0)
+    set_point(LEFT_ELBOW, *lelbow)
+    set_point(RIGHT_ELBOW, *relbow)
+    set_point(LEFT_WRIST, *lwrist)
+    set_point(RIGHT_WRIST, *rwrist)
+
+    def hand_points(wrist: tuple[float, float, float], side_sign: float) -> tuple[tuple[float, float, float], tuple[float, float, float], tuple[float, float, float]]:
+        index_pt = (wrist[0] + side_sign * 0.02, wrist[1] - 0.02, wrist[2] + HAND_LEN)
+        pinky_pt = (wrist[0] - side_sign * 0.02, wrist[1] - 0.02, wrist[2] + HAND_LEN * 0.9)
+        thumb_pt = (wrist[0] + side_sign * 0.03, wrist[1] - 0.01, wrist[2] + HAND_LEN * 0.5)
+        return index_pt, pinky_pt, thumb_pt
+
+    l_index, l_pinky, l_thumb = hand_points(lwrist, -1.0)
+    r_index, r_pinky, r_thumb = hand_points(rwrist, 1.0)
+    set_point(LEFT_INDEX, *l_index)
+    set_point(LEFT_PINKY, *l_pinky)
+    set_point(LEFT_THUMB, *l_thumb)
+    set_point(RIGHT_INDEX, *r_index)
+    set_point(RIGHT_PINKY, *r_pinky)
+    set_point(RIGHT_THUMB, *r_thumb)
+
+    return _finish_pose(pelvis_center, 0.0, 0.0)
+
+
+def _gen_walk(frame_index: int) -> list[dict]:
+    # "sine" behaves like a walk cycle
+    return _walk_pose(frame_index, _WALK_OMEGA, 0.25, 0.03, 0.04, _set_point)
+
+
+def _gen_idle(frame_index: int) -> list[dict]:
+    # Gentle sway in place
+    return _walk_pose(frame_index, _IDLE_OMEGA, 0.0, 0.03, 0.01, _set_point)
+
+
+def _gen_random(frame_index: int) -> list[dict]:
+    # Walk cycle with extra positional jitter on every landmark
+    return _walk_pose(frame_index, _WALK_OMEGA, 0.25, 0.03, 0.04, _set_point_random)
+
+
+def _gen_climb(frame_index: int) -> list[dict]:
+    """Climbing skeleton: limbs follow ClimbController holds, slower cadence."""
+    global _CLIMB_CTRL
+    t = frame_index / 60.0
+    omega = _CLIMB_OMEGA
+    sway_amp = 0.015
+    bob_amp = 0.02
+
+    # Climbing: pelvis stays at fixed height, just sways for balance
+    bob = bob_amp * math.sin(2.0 * omega * t) * 0.3
+    sway = sway_amp * math.sin(omega * t * 0.7) * 0.8
+    pelvis_center = (0.0 + sway, PELVIS_Y_BASE + bob, 0.02)
+
+    set_point = _set_point
+    lhip, rhip, lsh, rsh = _set_torso_and_head(pelvis_center, set_point)
+
+    # Use climbing controller for realistic limb placements on wall holds
+    if _CLIMB_CTRL is None:
+        _CLIMB_CTRL = ClimbController()
+    limb_positions = _CLIMB_CTRL.update(frame_index)
+
+    # Torso lean toward wall and slight bias to active hand
+    torso_lean_z = 0.05
+    active_bias = 0.0
+    if _CLIMB_CTRL.active_limb in ("LH", "RH"):
+        active_bias = -0.03 if _CLIMB_CTRL.active_limb == "LH" else 0.03
+    lsh = (lsh[0] - active_bias, lsh[1], lsh[2] + torso_lean_z)
+    rsh = (rsh[0] + active_bias, rsh[1], rsh[2] + torso_lean_z)
+    lhip = (lhip[0] - active_bias * 0.5, lhip[1], lhip[2] + torso_lean_z * 0.4)
+    rhip = (rhip[0] + active_bias * 0.5, rhip[1], rhip[2] + torso_lean_z * 0.4)
+
+    # Hands to holds and elbows bent toward shoulders
+    lwrist = limb_positions["LH"]
+    rwrist = limb_positions["RH"]
+    lelbow = ((lsh[0] + lwrist[0]) * 0.5, (lsh[1] + lwrist[1]) * 0.5, (lsh[2] + lwrist[2]) * 0.5)
+    relbow = ((rsh[0] + rwrist[0]) * 0.5, (rsh[1] + rwrist[1]) * 0.5, (rsh[2] + rwrist[2]) * 0.5)
+    set_point(LEFT_ELBOW, *lelbow)
+    set_point(RIGHT_ELBOW, *relbow)
+    set_point(LEFT_WRIST, *lwrist)
+    set_point(RIGHT_WRIST, *rwrist)
+
+    # Feet to holds and knees slightly bent forward
+    lankle = limb_positions["LF"]
+    rankle = limb_positions["RF"]
+    lknee = ((lhip[0] + lankle[0]) * 0.5, (lhip[1] + lankle[1]) * 0.6, (lhip[2] + lankle[2]) * 0.5)
+    rknee = ((rhip[0] + rankle[0]) * 0.5, (rhip[1] + rankle[1]) * 0.6, (rhip[2] + rankle[2]) * 0.5)
+    set_point(LEFT_KNEE, *lknee)
+    set_point(RIGHT_KNEE, *rknee)
+    set_point(LEFT_ANKLE, *lankle)
+    set_point(RIGHT_ANKLE, *rankle)
+
+    # Feet pressing the wall
+    lheel = (lankle[0], lankle[1] - 0.02, lankle[2] - FOOT_LEN * 0.15)
+    rheel = (rankle[0], rankle[1] - 0.02, rankle[2] - FOOT_LEN * 0.15)
+    ltoe = (lankle[0], lankle[1] - 0.005, lankle[2] + FOOT_LEN * 0.5)
+    rtoe = (rankle[0], rankle[1] - 0.005, rankle[2] + FOOT_LEN * 0.5)
+    set_point(LEFT_HEEL, *lheel)
+    set_point(RIGHT_HEEL, *rheel)
+    set_point(LEFT_FOOT_INDEX, *ltoe)
+    set_point(RIGHT_FOOT_INDEX, *rtoe)
+
+    # Finger approximations on the wall
+    def hand_points_wall(wrist: tuple[float, float, float], side_sign: float) -> tuple[tuple[float, float, float], tuple[float, float, float], tuple[float, float, float]]:
+        index_pt = (wrist[0] + side_sign * 0.015, wrist[1] - 0.01, wrist[2] + 0.005)
+        pinky_pt = (wrist[0] - side_sign * 0.015, wrist[1] - 0.01, wrist[2] + 0.005)
+        thumb_pt = (wrist[0] + side_sign * 0.02, wrist[1] - 0.005, wrist[2] - 0.005)
+        return index_pt, pinky_pt, thumb_pt
+
+    l_index, l_pinky, l_thumb = hand_points_wall(lwrist, -1.0)
+    r_index, r_pinky, r_thumb = hand_points_wall(rwrist, 1.0)
+    set_point(LEFT_INDEX, *l_index)
+    set_point(LEFT_PINKY, *l_pinky)
+    set_point(LEFT_THUMB, *l_thumb)
+    set_point(RIGHT_INDEX, *r_index)
+    set_point(RIGHT_PINKY, *r_pinky)
+    set_point(RIGHT_THUMB, *r_thumb)
+
+    # Add movement around the canvas: a moving offset that changes slowly over time
+    t = frame_index / 300.0  # Complete a cycle every 5 seconds at 60fps
+    offset_x = 0.15 * math.sin(t)  # Horizontal movement
+    offset_y = 0.1 * math.sin(t * 1.3)  # Vertical movement with different frequency
+    return _finish_pose(pelvis_center, offset_x, offset_y)
+
+
+# Mode -> specialized generator, resolved once by callers instead of branching per frame
+_MODE_TABLE = {
+    "sine": _gen_walk,
+    "walk": _gen_walk,
+    "idle": _gen_idle,
+    "random": _gen_random,
+    "climb": _gen_climb,
+}
+
+
+def generate_fake_landmarks(
+    frame_index: int,
+    num_landmarks: int,
+    mode: str,
+) -> list[dict]:
+    """Generate anatomically plausible MediaPipe Pose landmarks (33 points).
+
+    The skeleton is built from simple segment lengths and animated with a
+    lightweight gait/idle model. Coordinates are in meters-ish, with
+    x (right), y (up), z (forward).
+    """
     # Respect requested landmark count by truncating (kept for compatibility)
-    return points[:num_landmarks]
+    return _MODE_TABLE[mode](frame_index)[:num_landmarks]
+
+
+class _PoseClientListener(WSListener if ws_connect is not None else object):
+    """Minimal picows listener; the fake streamer only ever sends frames."""
+
+    def on_ws_connected(self, transport) -> None:
+        pass
+
+    def on_ws_frame(self, transport, frame) -> None:
+        # picows leaves the close handshake to the listener
+        if frame.msg_type == WSMsgType.CLOSE:
+            transport.send_close(frame.get_close_code())
+            transport.disconnect()
+
+
+async def _stream_frames(send, args: argparse.Namespace, frame_index: int) -> int:
+    """Send generated frames through ``send`` until the connection drops.
+
+    Returns the next frame index so numbering continues across reconnects.
+    """
+    target_fps = max(1, args.fps)
+    delay = 1.0 / target_fps
+    # The event loop's cached monotonic clock; avoids a time.perf_counter() call per frame
+    loop = asyncio.get_running_loop()
+    generate = _MODE_TABLE[args.mode]
+    num_landmarks = args.num_landmarks
+
+    while True:
+        start = loop.time()
+
+        landmarks = generate(frame_index)[:num_landmarks]
+
+        try:
+            if landmarks:
+                out = {
+                    "type": "pose",
+                    "timestamp": int(time.time() * 1000),  # Current timestamp in ms
+                    "frame_number": frame_index,
+                    "landmarks": landmarks
+                }
+                await send(json.dumps(out))
+        except (ConnectionClosed, ConnectionError):
+            print("\nConnection lost. Reconnecting...")
+            return frame_index
+
+        frame_index += 1
+
+        # Enforce target FPS accounting for time spent computing/sending
+        elapsed = loop.time() - start
+        sleep_for = max(0.0, delay - elapsed)
+        await asyncio.sleep(sleep_for)
+
+
+async def _stream_with_picows(args: argparse.Namespace, frame_index: int) -> int:
+    transport, _ = await ws_connect(_PoseClientListener, args.ws_uri)
+    print("Successfully connected to WebSocket server (picows).")
+
+    async def send(payload: str) -> None:
+        if transport.is_disconnected:
+            raise ConnectionError("WebSocket closed")
+        # PoseConsumer.receive() only handles text frames
+        transport.send(WSMsgType.TEXT, payload.encode())
+
+    try:
+        return await _stream_frames(send, args, frame_index)
+    finally:
+        transport.disconnect()
+
+
+async def _stream_with_websockets(args: argparse.Namespace, frame_index: int) -> int:
+    async with websockets.connect(args.ws_uri) as websocket:
+        print("Successfully connected to WebSocket server.")
+        return await _stream_frames(websocket.send, args, frame_index)
 
 
 async def stream_fake_pose_landmarks() -> None:
@@ -543,45 +644,16 @@ async def stream_fake_pose_landmarks() -> None:
     if args.seed is not None:
         random.seed(args.seed)
 
-    target_fps = max(1, args.fps)
-    delay = 1.0 / target_fps
+    # picows keeps the per-frame send path in C; fall back to websockets if missing
+    stream = _stream_with_picows if ws_connect is not None else _stream_with_websockets
     frame_index = 0
 
     while True:
         print(f"Attempting to connect to WebSocket server at {args.ws_uri}...")
         try:
-            async with websockets.connect(args.ws_uri) as websocket:
-                print("Successfully connected to WebSocket server.")
-                while True:
-                    start = time.perf_counter()
-
-                    landmarks = generate_fake_landmarks(
-                        frame_index=frame_index,
-                        num_landmarks=args.num_landmarks,
-                        mode=args.mode,
-                    )
-
-                    try:
-                        if landmarks:
-                            out = {
-                                "type": "pose",
-                                "timestamp": int(time.time() * 1000),  # Current timestamp in ms
-                                "frame_number": frame_index,
-                                "landmarks": landmarks
-                            }
-                            await websocket.send(json.dumps(out))
-                    except websockets.exceptions.ConnectionClosed:
-                        print("\nConnection lost. Reconnecting...")
-                        break
-
-                    frame_index += 1
-
-                    # Enforce target FPS accounting for time spent computing/sending
-                    elapsed = time.perf_counter() - start
-                    sleep_for = max(0.0, delay - elapsed)
-                    await asyncio.sleep(sleep_for)
-
-        except (websockets.exceptions.ConnectionClosedError, ConnectionRefusedError, OSError) as e:
+            frame_index = await stream(args, frame_index)
+
+        except (ConnectionClosedError, ConnectionRefusedError, OSError) as e:
             print(f"Failed to connect: {e}. Retrying in 5 seconds...")
             await asyncio.sleep(5)
         except Exception as e:
@@ -607,6 +679,7 @@ class FakePoseStreamer:
         self.mode = mode
         self.fps = fps
         self.frame_index = 0
+        self._gen = _MODE_TABLE[mode]
         
         if seed is not None:
             random.seed(seed)
@@ -626,11 +699,7 @@ class FakePoseStreamer:
             and pose_data is a dictionary with pose landmarks.
         """
         # Generate fake landmarks
-        landmarks = generate_fake_landmarks(
-            frame_index=self.frame_index,
-            num_landmarks=33,
-            mode=self.mode,
-        )
+        landmarks = self._gen(self.frame_index)
         
         # Convert to expected format for pose touch detector
         pose_data = {
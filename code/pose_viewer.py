@@ -5,14 +5,135 @@ Simple script to open a video file, detect human pose with MediaPipe, and displa
 
 import cv2
 import mediapipe as mp
+from mediapipe.framework.formats import landmark_pb2
+import numpy as np
 import argparse
 import os
+import queue
+import threading
+import time
+
+# Long side of the frame handed to MediaPipe. The pose model itself runs at
+# 256x256, so full-resolution input only adds preprocessing cost.
+INFERENCE_SIZE = 512
+
+
+# Same thresholds and connection style as mediapipe's drawing_utils.draw_landmarks
+VISIBILITY_THRESHOLD = 0.5
+PRESENCE_THRESHOLD = 0.5
+CONNECTION_COLOR = (224, 224, 224)
+CONNECTION_THICKNESS = 2
+LANDMARK_BORDER_COLOR = (224, 224, 224)
+
+
+def draw_pose(frame, pose_landmarks, connections, landmark_specs):
+    """
+    Draw a pose like mediapipe's draw_landmarks, with all connections in one call.
+    
+    Args:
+        frame: BGR image to draw on
+        pose_landmarks: NormalizedLandmarkList from pose.process
+        connections: (N, 2) int array of landmark index pairs
+        landmark_specs: Per-landmark DrawingSpec list
+    """
+    landmarks = pose_landmarks.landmark
+    values = np.fromiter(
+        (v for lm in landmarks for v in (
+            lm.x, lm.y,
+            lm.visibility if lm.HasField('visibility') else 1.0,
+            lm.presence if lm.HasField('presence') else 1.0)),
+        dtype=np.float32, count=4 * len(landmarks)
+    ).reshape(-1, 4)
+    
+    # Only landmarks that are confidently present and inside the image are drawn
+    xy = values[:, :2]
+    drawn = ((values[:, 2] >= VISIBILITY_THRESHOLD) & (values[:, 3] >= PRESENCE_THRESHOLD)
+             & (xy >= 0).all(axis=1) & (xy <= 1).all(axis=1))
+    height, width = frame.shape[:2]
+    pixels = np.minimum(np.floor(xy * (width, height)), (width - 1, height - 1)).astype(np.int32)
+    
+    # Connections whose two ends are both drawn, as one polylines call
+    segments = pixels[connections[drawn[connections].all(axis=1)]]
+    if len(segments):
+        cv2.polylines(frame, list(segments), False, CONNECTION_COLOR, CONNECTION_THICKNESS)
+    
+    # Landmark points go on top of the lines
+    for idx in np.flatnonzero(drawn):
+        spec = landmark_specs[idx]
+        center = (int(pixels[idx, 0]), int(pixels[idx, 1]))
+        border_radius = max(spec.circle_radius + 1, int(spec.circle_radius * 1.2))
+        cv2.circle(frame, center, border_radius, LANDMARK_BORDER_COLOR, spec.thickness)
+        cv2.circle(frame, center, spec.circle_radius, spec.color, spec.thickness)
+
+
+def create_pose_landmarker(model_path, gpu):
+    """
+    Create a Tasks API pose landmarker in VIDEO mode, on the GPU delegate if requested.
+    
+    Falls back to the CPU delegate when the GPU one cannot be created.
+    """
+    from mediapipe.tasks import python as mp_tasks
+    from mediapipe.tasks.python import vision
+    
+    def create(delegate):
+        options = vision.PoseLandmarkerOptions(
+            base_options=mp_tasks.BaseOptions(model_asset_path=model_path, delegate=delegate),
+            running_mode=vision.RunningMode.VIDEO,
+            num_poses=1,
+            min_pose_detection_confidence=0.5,
+            min_tracking_confidence=0.5
+        )
+        return vision.PoseLandmarker.create_from_options(options)
+    
+    if gpu:
+        try:
+            landmarker = create(mp_tasks.BaseOptions.Delegate.GPU)
+            print(f"Pose landmarker {model_path} running on GPU delegate")
+            return landmarker
+        except Exception as e:
+            print(f"GPU delegate unavailable, falling back to CPU: {e}")
+    
+    landmarker = create(mp_tasks.BaseOptions.Delegate.CPU)
+    print(f"Pose landmarker {model_path} running on CPU delegate")
+    return landmarker
+
+
+def to_landmark_list(task_landmarks):
+    """Convert Tasks API landmarks to the NormalizedLandmarkList solutions.pose returns."""
+    landmarks = landmark_pb2.NormalizedLandmarkList()
+    landmarks.landmark.extend(
+        landmark_pb2.NormalizedLandmark(
+            x=lm.x, y=lm.y, z=lm.z,
+            visibility=lm.visibility or 0.0, presence=lm.presence or 0.0)
+        for lm in task_landmarks
+    )
+    return landmarks
+
+
+def _put(q, item, stop):
+    """Blocking put that gives up once stop is set."""
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
 
 def main():
     # Setup argument parser
     parser = argparse.ArgumentParser(description="Display video with pose detection overlay.")
     parser.add_argument("--file", default="data/bolder2.mov", help="Path to video file. Default is data/bolder2.mov")
     parser.add_argument("--loop", action="store_true", help="Loop the video indefinitely.")
+    parser.add_argument("--target-fps", type=float, default=None,
+                        help="Run pose detection at this rate; other frames are skipped without decoding. Default is the video FPS.")
+    parser.add_argument("--pose-model", default=None,
+                        help="Path to a MediaPipe Tasks pose landmarker .task model (enables the Tasks API).")
+    parser.add_argument("--gpu", action="store_true",
+                        help="Run the Tasks API pose landmarker on the GPU delegate (requires --pose-model).")
+    parser.add_argument("--opencl", action="store_true",
+                        help="Rotate/resize and preprocess frames on an OpenCL device via cv2.UMat when available.")
     args = parser.parse_args()
 
     # Check if the video file exists
@@ -22,20 +143,25 @@ def main():
 
     # Initialize MediaPipe Pose
     mp_pose = mp.solutions.pose
-    mp_drawing = mp.solutions.drawing_utils
     mp_drawing_styles = mp.solutions.drawing_styles
     
     # For static images:
     # pose = mp_pose.Pose(static_image_mode=True, model_complexity=2, enable_segmentation=True)
     
     # For video input:
-    pose = mp_pose.Pose(
-        static_image_mode=False, 
-        model_complexity=1, 
-        enable_segmentation=False, 
-        min_detection_confidence=0.5,
-        min_tracking_confidence=0.5
-    )
+    if args.pose_model:
+        # Tasks API landmarker, which can run on the GPU delegate
+        pose = create_pose_landmarker(args.pose_model, args.gpu)
+    else:
+        if args.gpu:
+            print("--gpu requires --pose-model; using the CPU solutions.pose model")
+        pose = mp_pose.Pose(
+            static_image_mode=False, 
+            model_complexity=1, 
+            enable_segmentation=False, 
+            min_detection_confidence=0.5,
+            min_tracking_confidence=0.5
+        )
 
     # Open video file
     cap = cv2.VideoCapture(args.file)
@@ -117,14 +243,36 @@ def main():
     else:
         print(f"Display Resolution: {actual_frame_width}x{actual_frame_height} (no transformation needed)")
     print(f"FPS: {fps}")
+    
+    # Sample every Nth source frame when a lower processing rate is requested
+    target_interval = 1
+    if args.target_fps and fps > 0:
+        target_interval = max(1, round(fps / args.target_fps))
+        print(f"Processing every {target_interval} frame(s) (~{fps / target_interval:.1f} FPS)")
+    
+    # OpenCV's T-API: UMat operations run on the OpenCL device when enabled
+    use_opencl = args.opencl and cv2.ocl.haveOpenCL()
+    if args.opencl and not use_opencl:
+        print("OpenCL is not available; preprocessing frames on the CPU")
+    cv2.ocl.setUseOpenCL(use_opencl)
     print("Press 'q' to quit, ' ' to pause/resume")
 
-    paused = False
-    frame_count = 0
+    # Decode, inference and display run on separate threads connected by small
+    # bounded queues, so decoding the next frame overlaps with pose inference.
+    # Video frames are never dropped: a full queue blocks its producer, and the
+    # display pacing below throttles the whole pipeline.
+    frame_q = queue.Queue(maxsize=4)
+    result_q = queue.Queue(maxsize=4)
+    stop = threading.Event()
 
-    while True:
-        if not paused:
-            ret, frame = cap.read()
+    def decode():
+        frame_count = 0
+        # When the frame is rotated/resized, the decoded frame is only a
+        # temporary: decode into the same buffer every time
+        raw_buf = None
+        while not stop.is_set():
+            # grab() only demuxes; frames that will be skipped are never decoded
+            ret = cap.grab()
             if not ret:
                 if args.loop:
                     print("Restarting video from beginning...")
@@ -132,10 +280,39 @@ def main():
                     frame_count = 0
                     continue
                 else:
-                    print("End of video.")
                     break
             
             frame_count += 1
+            if (frame_count - 1) % target_interval:
+                continue
+            
+            if needs_rotation or needs_resize:
+                ret, frame = cap.retrieve(raw_buf)
+                raw_buf = frame
+            else:
+                ret, frame = cap.retrieve()
+            if not ret:
+                continue
+            
+            if use_opencl:
+                # Upload once; orientation fix, downscale and RGB conversion run
+                # on the device and only the display frame and the small RGB
+                # inference input are downloaded
+                umat = cv2.UMat(frame)
+                if needs_rotation and orientation_meta in (90, 270):
+                    umat = cv2.rotate(umat, cv2.ROTATE_90_CLOCKWISE if orientation_meta == 90
+                                      else cv2.ROTATE_90_COUNTERCLOCKWISE)
+                elif needs_resize:
+                    umat = cv2.resize(umat, (int(display_width), int(display_height)))
+                frame = umat.get()
+                h, w = frame.shape[:2]
+                scale = min(INFERENCE_SIZE / max(h, w), 1.0)
+                if scale < 1.0:
+                    umat = cv2.resize(umat, (round(w * scale), round(h * scale)), interpolation=cv2.INTER_AREA)
+                frame_rgb = cv2.cvtColor(umat, cv2.COLOR_BGR2RGB).get()
+                if not _put(frame_q, (frame_count, frame, frame_rgb), stop):
+                    return
+                continue
             
             # Handle video orientation based on detected needs
             if needs_rotation:
@@ -150,34 +327,122 @@ def main():
                 # For .mp4 files with SAR, resize to correct portrait dimensions
                 frame = cv2.resize(frame, (int(display_width), int(display_height)))
             
-            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            if not _put(frame_q, (frame_count, frame, None), stop):
+                return
+        # End of video marker
+        _put(frame_q, None, stop)
+
+    def infer():
+        # Downscale and RGB conversion targets, reused for every frame of the same size
+        small_buf = None
+        rgb_buf = None
+        frame_shape = None
+        # Tasks VIDEO mode needs strictly increasing timestamps
+        last_timestamp_ms = -1
+        while not stop.is_set():
+            try:
+                item = frame_q.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if item is None:
+                _put(result_q, None, stop)
+                return
+            frame_count, frame, frame_rgb = item
+            
+            # frame_rgb is already set when the frame was preprocessed with OpenCL
+            if frame_rgb is None:
+                if frame.shape != frame_shape:
+                    frame_shape = frame.shape
+                    h, w = frame_shape[:2]
+                    scale = min(INFERENCE_SIZE / max(h, w), 1.0)
+                    small_size = (round(w * scale), round(h * scale))
+                    small_buf = np.empty((small_size[1], small_size[0], 3), dtype=np.uint8)
+                    rgb_buf = np.empty_like(small_buf)
+                
+                # Landmarks are normalized, so they map straight back onto the full frame
+                if scale < 1.0:
+                    small = cv2.resize(frame, small_size, dst=small_buf, interpolation=cv2.INTER_AREA)
+                else:
+                    small = frame
+                frame_rgb = cv2.cvtColor(small, cv2.COLOR_BGR2RGB, dst=rgb_buf)
             
             # Process the frame and detect pose
-            results = pose.process(frame_rgb)
+            if args.pose_model:
+                timestamp_ms = max(int(time.monotonic() * 1000), last_timestamp_ms + 1)
+                last_timestamp_ms = timestamp_ms
+                image = mp.Image(image_format=mp.ImageFormat.SRGB, data=frame_rgb)
+                result = pose.detect_for_video(image, timestamp_ms)
+                pose_landmarks = to_landmark_list(result.pose_landmarks[0]) if result.pose_landmarks else None
+            else:
+                pose_landmarks = pose.process(frame_rgb).pose_landmarks
+            
+            if not _put(result_q, (frame_count, frame, pose_landmarks), stop):
+                return
+
+    threads = [threading.Thread(target=decode, daemon=True), threading.Thread(target=infer, daemon=True)]
+    for thread in threads:
+        thread.start()
+
+    # Drawing style and connections never change; build them once
+    landmark_style = mp_drawing_styles.get_default_pose_landmarks_style()
+    landmark_specs = [landmark_style[landmark] for landmark in mp_pose.PoseLandmark]
+    pose_connections = np.array(sorted(mp_pose.POSE_CONNECTIONS), dtype=np.intp)
+
+    # Display is paced against a monotonic schedule so time spent waiting on
+    # inference and drawing is not added on top of the frame period
+    frame_period = target_interval / fps if fps > 0 else 1 / 30
+    next_frame_time = None
+
+    paused = False
+
+    while True:
+        if not paused:
+            try:
+                item = result_q.get(timeout=0.1)
+            except queue.Empty:
+                if not threads[1].is_alive():
+                    print("End of video.")
+                    break
+                cv2.waitKey(1)
+                continue
+            if item is None:
+                print("End of video.")
+                break
+            frame_count, frame, pose_landmarks = item
             
             # Draw pose landmarks on the frame
-            if results.pose_landmarks:
-                mp_drawing.draw_landmarks(
-                    frame,
-                    results.pose_landmarks,
-                    mp_pose.POSE_CONNECTIONS,
-                    landmark_drawing_spec=mp_drawing_styles.get_default_pose_landmarks_style()
-                )
+            if pose_landmarks:
+                draw_pose(frame, pose_landmarks, pose_connections, landmark_specs)
             
             # Add frame counter
             cv2.putText(frame, f"Frame: {frame_count}", (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
             
             # Display the frame
             cv2.imshow('Pose Detection', frame)
+            
+            now = time.monotonic()
+            if next_frame_time is None or now - next_frame_time > frame_period:
+                # First frame, or more than a frame behind: restart the schedule
+                next_frame_time = now
+            next_frame_time += frame_period
+            delay_ms = max(1, int((next_frame_time - time.monotonic()) * 1000))
+        else:
+            delay_ms = max(1, int(frame_period * 1000))
         
         # Handle key presses
-        key = cv2.waitKey(int(1000/fps) if fps > 0 else 30) & 0xFF
+        key = cv2.waitKey(delay_ms) & 0xFF
         if key == ord('q'):
             break
         elif key == ord(' '):
             paused = not paused
+            next_frame_time = None
             print("Paused" if paused else "Resumed")
 
+    # Stop the pipeline threads before releasing the capture they read from
+    stop.set()
+    for thread in threads:
+        thread.join(timeout=1.0)
+
     # Clean up
     cap.release()
     cv2.destroyAllWindows()
@@ -15,8 +15,11 @@ Usage:
 import asyncio
 import json
 import argparse
+import re
 import sys
 import time
+from collections import Counter
+from itertools import compress
 from typing import Dict, List, Optional, Tuple
 import numpy as np
 
@@ -32,6 +35,19 @@ except ImportError:
     print("Error: pygame package not found. Install with: pip install pygame")
     sys.exit(1)
 
+# scipy is optional; without it nearest-hold queries fall back to brute force
+try:
+    from scipy.spatial import cKDTree
+except ImportError:
+    cKDTree = None
+
+# orjson is optional; it decodes the per-frame pose messages much faster
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
+
 try:
     import xml.etree.ElementTree as ET
 except ImportError:
@@ -47,10 +63,24 @@ POSE_CONNECTIONS = [
     (12, 14), (14, 16), (16, 18), (16, 20), (16, 22), (18, 20),  # Right arm
     (11, 23), (12, 24), (23, 24),  # Torso
     (23, 25), (25, 27), (27, 29), (29, 31),  # Left leg
-    (24, 26), (26, 28), (28, 30), (30, 32),  # Right leg
-    (27, 29), (28, 30), (29, 31), (30, 32)  # Feet
+    (24, 26), (26, 28), (28, 30), (30, 32)  # Right leg (feet edges included)
+]
+
+# POSE_CONNECTIONS walked as polylines, each edge exactly once and in its
+# listed direction (thick lines are not symmetric in their end pixels)
+POSE_CHAINS = [
+    [0, 1, 2, 3, 7], [0, 4, 5, 6, 8],  # Face
+    [9, 10],  # Mouth
+    [11, 12, 24], [11, 23, 24],  # Shoulders and torso
+    [11, 13, 15, 17, 19], [15, 19], [15, 21],  # Left arm
+    [12, 14, 16, 18, 20], [16, 20], [16, 22],  # Right arm
+    [23, 25, 27, 29, 31],  # Left leg
+    [24, 26, 28, 30, 32],  # Right leg
 ]
 
+# Numbers in SVG path data (coordinates, with optional exponent)
+PATH_NUMBER_RE = re.compile(r'[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?')
+
 # MediaPipe landmark names for reference
 LANDMARK_NAMES = [
     'nose_tip', 'nose', 'left_eye_inner', 'left_eye', 'left_eye_outer',
@@ -74,38 +104,57 @@ class SVGParser:
         self.svg_width = 0
         self.svg_height = 0
         self._parse_svg()
+        
+        # Number of holds per status, kept current by update_hold_status
+        self.status_counts = Counter(hold['status'] for hold in self.holds.values())
+        
+        # Spatial index over hold centers for nearest-hold queries
+        self.hold_ids = list(self.holds)
+        self.hold_centers = np.array(
+            [[hold['center_x'], hold['center_y']] for hold in self.holds.values()],
+            dtype=np.float64
+        ).reshape(-1, 2)
+        self.hold_tree = cKDTree(self.hold_centers) if cKDTree is not None and self.hold_ids else None
     
     def _parse_svg(self):
         """Parse SVG file and extract hold information"""
         try:
-            tree = ET.parse(self.svg_file_path)
-            root = tree.getroot()
-            
-            # Handle SVG namespaces
-            namespace = {'svg': 'http://www.w3.org/2000/svg'}
-            
-            # Get SVG dimensions
-            self.svg_width = float(root.get('width', 0))
-            self.svg_height = float(root.get('height', 0))
-            
-            # Check for viewBox
-            viewbox = root.get('viewBox')
-            if viewbox:
-                try:
-                    values = list(map(float, viewbox.split()))
-                    if len(values) >= 4:
-                        self.svg_width = values[2]
-                        self.svg_height = values[3]
-                except (ValueError, IndexError):
-                    pass
-            
-            # Extract holds (elements with class="hold" and id starting with "hold_")
-            # Handle both rect and path elements with proper namespace
-            for element in root.findall('.//svg:*[@class="hold"]', namespace):
+            # Stream the SVG instead of building the whole tree. Elements are
+            # handled on 'start' (attributes are complete, document order) and
+            # cleared on 'end' to keep memory flat.
+            svg_ns = '{http://www.w3.org/2000/svg}'
+            root = None
+            for event, element in ET.iterparse(self.svg_file_path, events=('start', 'end')):
+                if event == 'end':
+                    element.clear()
+                    continue
+                
+                if root is None:
+                    root = element
+                    
+                    # Get SVG dimensions
+                    self.svg_width = float(root.get('width', 0))
+                    self.svg_height = float(root.get('height', 0))
+                    
+                    # Check for viewBox
+                    viewbox = root.get('viewBox')
+                    if viewbox:
+                        try:
+                            values = list(map(float, viewbox.split()))
+                            if len(values) >= 4:
+                                self.svg_width = values[2]
+                                self.svg_height = values[3]
+                        except (ValueError, IndexError):
+                            pass
+                    continue
+                
+                # Extract holds (SVG elements with class="hold" and id starting with "hold_")
+                # Handle both rect and path elements
+                if element.get('class') != 'hold' or not element.tag.startswith(svg_ns):
+                    continue
                 hold_id = element.get('id')
                 if hold_id and hold_id.startswith('hold_'):
-                    # Remove namespace from tag for comparison
-                    tag_name = element.tag.split('}')[-1] if '}' in element.tag else element.tag
+                    tag_name = element.tag[len(svg_ns):]
                     
                     if tag_name == 'rect':
                         # Handle rectangle elements
@@ -151,6 +200,9 @@ class SVGParser:
         """
         Extract bounding box from SVG path data
         
+        Uses every coordinate pair in the path, including curve control points,
+        so the box may be slightly larger than the drawn outline but never smaller.
+        
         Args:
             path_d: SVG path d attribute string
             
@@ -158,67 +210,65 @@ class SVGParser:
             Dictionary with min_x, min_y, max_x, max_y or None if parsing fails
         """
         try:
-            import re
-            
-            # Extract all coordinates from path data
-            # Look for numbers after commands (M, L, C, etc.)
-            coords = re.findall(r'[MLC][\s,]*([\d.-]+)', path_d)
-            all_points = []
-            
-            # Parse the path data more comprehensively
-            # Split by commands and extract coordinates
-            parts = re.split(r'([MLC])', path_d)
-            current_x, current_y = 0, 0
-            
-            for i in range(1, len(parts), 2):
-                if i + 1 < len(parts):
-                    command = parts[i]
-                    coord_str = parts[i + 1]
-                    
-                    # Extract numbers from coordinate string
-                    numbers = re.findall(r'-?\d+\.?\d*', coord_str)
-                    
-                    if command == 'M':  # Move to
-                        if len(numbers) >= 2:
-                            current_x = float(numbers[0])
-                            current_y = float(numbers[1])
-                            all_points.append((current_x, current_y))
-                    elif command == 'L':  # Line to
-                        if len(numbers) >= 2:
-                            current_x = float(numbers[0])
-                            current_y = float(numbers[1])
-                            all_points.append((current_x, current_y))
-                    elif command == 'C':  # Curve to
-                        if len(numbers) >= 6:
-                            # For curves, we'll use the end point
-                            current_x = float(numbers[4])
-                            current_y = float(numbers[5])
-                            all_points.append((current_x, current_y))
-            
-            if not all_points:
+            numbers = np.asarray(PATH_NUMBER_RE.findall(path_d), dtype=np.float64)
+            if numbers.size < 2:
                 return None
             
             # Calculate bounding box
-            x_coords = [p[0] for p in all_points]
-            y_coords = [p[1] for p in all_points]
+            points = numbers[:numbers.size // 2 * 2].reshape(-1, 2)
+            min_x, min_y = points.min(axis=0)
+            max_x, max_y = points.max(axis=0)
             
             return {
-                'min_x': min(x_coords),
-                'max_x': max(x_coords),
-                'min_y': min(y_coords),
-                'max_y': max(y_coords)
+                'min_x': float(min_x),
+                'max_x': float(max_x),
+                'min_y': float(min_y),
+                'max_y': float(max_y)
             }
             
         except Exception as e:
             print(f"Error parsing path bounding box: {e}")
             return None
     
-    def update_hold_status(self, hold_data: List[Dict]):
-        """Update hold status from session data"""
+    def nearest_holds(self, points: np.ndarray, max_distance: float = np.inf) -> List[Optional[str]]:
+        """
+        Find the nearest hold center to each point, in SVG coordinates.
+        
+        Args:
+            points: (N, 2) array of SVG x, y positions (e.g. hand landmarks)
+            max_distance: Points farther than this from every hold get None
+            
+        Returns:
+            Hold ID or None for each point
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        if not self.hold_ids or not len(points):
+            return [None] * len(points)
+        
+        if self.hold_tree is not None:
+            dists, idxs = self.hold_tree.query(points, k=1, distance_upper_bound=max_distance)
+        else:
+            all_dists = np.linalg.norm(points[:, None, :] - self.hold_centers[None, :, :], axis=2)
+            idxs = all_dists.argmin(axis=1)
+            dists = all_dists[np.arange(len(points)), idxs]
+        
+        return [self.hold_ids[idx] if dist <= max_distance else None
+                for dist, idx in zip(dists.tolist(), idxs.tolist())]
+    
+    def update_hold_status(self, hold_data: List[Dict]) -> List[str]:
+        """Update hold status from session data, returning IDs of changed holds"""
+        changed = []
         for hold in hold_data:
             hold_id = hold.get('id')
             if hold_id and hold_id in self.holds:
-                self.holds[hold_id]['status'] = hold.get('status', 'untouched')
+                status = hold.get('status', 'untouched')
+                old_status = self.holds[hold_id]['status']
+                if old_status != status:
+                    self.holds[hold_id]['status'] = status
+                    self.status_counts[old_status] -= 1
+                    self.status_counts[status] += 1
+                    changed.append(hold_id)
+        return changed
 
 
 class PoseVisualizer:
@@ -260,9 +310,18 @@ class PoseVisualizer:
         self.LANDMARK_COLOR = (255, 200, 100)
         self.TEXT_COLOR = (255, 255, 255)
         
+        # Landmark circle (color, radius) by landmark index
+        self.landmark_styles = [(self.LANDMARK_COLOR, 5)] * 33
+        for i in (15, 16):  # Wrists
+            self.landmark_styles[i] = ((255, 100, 100), 8)  # Red for hands
+        for i in (19, 20, 21, 22):  # Fingers
+            self.landmark_styles[i] = ((255, 150, 150), 6)  # Light red for fingers
+        
         # State
         self.running = False
-        self.current_pose = []
+        # Latest pose as SVG x, y and visibility per landmark, filled in place
+        self.pose_buf = np.zeros((33, 3), dtype=np.float64)
+        self.pose_valid = False
         self.session_info = {}
         self.last_update_time = 0
         self.message_count = 0
@@ -274,6 +333,35 @@ class PoseVisualizer:
         self.clock = pygame.time.Clock()
         self.font = pygame.font.Font(None, 24)
         self.small_font = pygame.font.Font(None, 18)
+        self.info_cache = []  # (text, rendered surface) per info panel row
+        
+        # Hold geometry and labels never change; only status does. Precompute
+        # screen rectangles and rendered ID labels once.
+        self.hold_colors = {
+            'completed': self.HOLD_COMPLETED_COLOR,
+            'touched': self.HOLD_TOUCHED_COLOR,
+        }
+        self.hold_rects = {}
+        self.hold_labels = {}
+        self.hold_areas = {}
+        for hold_id, hold in self.svg_parser.holds.items():
+            x, y = self.svg_to_screen(hold['x'], hold['y'])
+            rect = pygame.Rect(x, y, int(hold['width'] * self.scale), int(hold['height'] * self.scale))
+            label = self.small_font.render(hold['id'], True, self.TEXT_COLOR)
+            self.hold_rects[hold_id] = rect
+            self.hold_labels[hold_id] = (label, label.get_rect(center=rect.center))
+            self.hold_areas[hold_id] = rect.union(self.hold_labels[hold_id][1])
+        
+        # The wall (background and holds) is drawn once to an off-screen surface
+        # and only changed holds are redrawn. Each frame restores the regions
+        # covered by the previous skeleton and info panel from it and updates
+        # only the dirty rectangles on the display.
+        self.wall_surface = pygame.Surface((window_width, window_height))
+        self.wall_scratch = pygame.Surface((window_width, window_height))
+        self.changed_holds = set()
+        self.draw_holds()
+        # The first frame pushes the whole window
+        self.prev_dirty = [self.screen.get_rect()]
     
     def svg_to_screen(self, x: float, y: float) -> Tuple[int, int]:
         """Convert SVG coordinates to screen coordinates"""
@@ -282,70 +370,89 @@ class PoseVisualizer:
         return screen_x, screen_y
     
     def draw_holds(self):
-        """Draw all holds on the wall"""
-        for hold in self.svg_parser.holds.values():
-            # Convert coordinates
-            x, y = self.svg_to_screen(hold['x'], hold['y'])
-            width = int(hold['width'] * self.scale)
-            height = int(hold['height'] * self.scale)
-            
-            # Choose color based on status
-            if hold['status'] == 'completed':
-                color = self.HOLD_COMPLETED_COLOR
-            elif hold['status'] == 'touched':
-                color = self.HOLD_TOUCHED_COLOR
-            else:
-                color = self.HOLD_UNTOUCHED_COLOR
-            
-            # Draw hold rectangle
-            pygame.draw.rect(self.screen, color, (x, y, width, height))
-            pygame.draw.rect(self.screen, (255, 255, 255), (x, y, width, height), 1)
-            
-            # Draw hold ID
-            text = self.small_font.render(hold['id'], True, self.TEXT_COLOR)
-            text_rect = text.get_rect(center=(x + width//2, y + height//2))
-            self.screen.blit(text, text_rect)
+        """Draw the background and all holds onto the cached wall surface"""
+        self.wall_surface.fill(self.BG_COLOR)
+        for hold_id in self.svg_parser.holds:
+            self.draw_hold(hold_id)
+    
+    def redraw_wall_area(self, area: pygame.Rect):
+        """Redraw the background and holds within an area of the cached wall"""
+        # Holds overlap, so every hold touching the area is redrawn in the
+        # original order. They are drawn unclipped on a scratch surface and the
+        # area copied back, because pygame draws clipped outlines along the
+        # clip edge.
+        self.wall_scratch.fill(self.BG_COLOR, area)
+        for hold_id, hold_area in self.hold_areas.items():
+            if hold_area.colliderect(area):
+                self.draw_hold(hold_id, self.wall_scratch)
+        self.wall_surface.blit(self.wall_scratch, area, area)
+    
+    def draw_hold(self, hold_id: str, surface: Optional[pygame.Surface] = None):
+        """Draw a single hold onto the cached wall surface (or another surface)"""
+        if surface is None:
+            surface = self.wall_surface
+        hold = self.svg_parser.holds[hold_id]
+        rect = self.hold_rects[hold_id]
+        
+        # Choose color based on status
+        color = self.hold_colors.get(hold['status'], self.HOLD_UNTOUCHED_COLOR)
+        
+        # Draw hold rectangle
+        pygame.draw.rect(surface, color, rect)
+        pygame.draw.rect(surface, (255, 255, 255), rect, 1)
+        
+        # Draw hold ID
+        label, label_rect = self.hold_labels[hold_id]
+        surface.blit(label, label_rect)
     
-    def draw_skeleton(self):
-        """Draw the climber skeleton from pose landmarks"""
-        if not self.current_pose or len(self.current_pose) < 33:
+    def set_pose(self, pose: List[Dict]):
+        """Copy pose landmarks from a message into the preallocated pose buffer"""
+        self.pose_valid = False
+        if len(pose) < 33:
             return
         
-        # Convert landmarks to screen coordinates
-        screen_landmarks = []
-        for landmark in self.current_pose:
-            x, y = self.svg_to_screen(landmark['x'], landmark['y'])
-            screen_landmarks.append((x, y))
-        
-        # Draw connections
-        for start_idx, end_idx in POSE_CONNECTIONS:
-            if (start_idx < len(screen_landmarks) and end_idx < len(screen_landmarks) and
-                self.current_pose[start_idx]['visibility'] > 0.5 and
-                self.current_pose[end_idx]['visibility'] > 0.5):
-                
-                start_pos = screen_landmarks[start_idx]
-                end_pos = screen_landmarks[end_idx]
-                pygame.draw.line(self.screen, self.SKELETON_COLOR, start_pos, end_pos, 3)
-        
-        # Draw landmarks
-        for i, (x, y) in enumerate(screen_landmarks):
-            if i < len(self.current_pose) and self.current_pose[i]['visibility'] > 0.5:
-                # Color based on landmark type
-                if i in [15, 16]:  # Wrists
-                    color = (255, 100, 100)  # Red for hands
-                    radius = 8
-                elif i in [19, 20, 21, 22]:  # Fingers
-                    color = (255, 150, 150)  # Light red for fingers
-                    radius = 6
-                else:
-                    color = self.LANDMARK_COLOR
-                    radius = 5
-                
-                pygame.draw.circle(self.screen, color, (x, y), radius)
-                pygame.draw.circle(self.screen, (255, 255, 255), (x, y), radius, 1)
+        buf = self.pose_buf
+        for i, landmark in enumerate(pose[:33]):
+            buf[i, 0] = landmark['x']
+            buf[i, 1] = landmark['y']
+            buf[i, 2] = landmark['visibility']
+        self.pose_valid = True
     
-    def draw_info(self):
-        """Draw session information"""
+    def draw_skeleton(self) -> List[pygame.Rect]:
+        """Draw the climber skeleton from pose landmarks, returning drawn areas"""
+        drawn = []
+        if not self.pose_valid:
+            return drawn
+        
+        # Convert landmarks to screen coordinates in one affine step
+        screen_xy = (self.pose_buf[:, :2] * self.scale + (self.offset_x, self.offset_y)).astype(np.int32)
+        visible = self.pose_buf[:, 2] > 0.5
+        screen = screen_xy.tolist()
+        
+        # Draw connections as one polyline per run of visible landmarks in a chain
+        visible_list = visible.tolist()
+        for chain in POSE_CHAINS:
+            points = []
+            for idx in chain:
+                if visible_list[idx]:
+                    points.append(screen[idx])
+                    continue
+                if len(points) > 1:
+                    drawn.append(pygame.draw.lines(self.screen, self.SKELETON_COLOR, False, points, 3))
+                points = []
+            if len(points) > 1:
+                drawn.append(pygame.draw.lines(self.screen, self.SKELETON_COLOR, False, points, 3))
+        
+        # Draw visible landmarks in index order, styled by landmark type
+        styles = compress(self.landmark_styles, visible_list)
+        for point, (color, radius) in zip(screen_xy[visible].tolist(), styles):
+            drawn.append(pygame.draw.circle(self.screen, color, point, radius))
+            pygame.draw.circle(self.screen, (255, 255, 255), point, radius, 1)
+        
+        return drawn
+    
+    def draw_info(self) -> List[pygame.Rect]:
+        """Draw session information, returning drawn areas"""
         info_texts = [
             f"Messages received: {self.message_count}",
             f"FPS: {int(self.clock.get_fps())}",
@@ -357,17 +464,51 @@ class PoseVisualizer:
             info_texts.append(f"Session started: {start_time}")
             info_texts.append(f"Status: {status}")
             
-            # Count holds by status
-            holds = self.svg_parser.holds
-            completed = sum(1 for h in holds.values() if h['status'] == 'completed')
-            total = len(holds)
+            # Hold counts by status are maintained by the parser
+            completed = self.svg_parser.status_counts['completed']
+            total = len(self.svg_parser.holds)
             info_texts.append(f"Holds completed: {completed}/{total}")
         
+        # Rendered lines are cached per row and only re-rendered when their
+        # text changes
+        del self.info_cache[len(info_texts):]
+        drawn = []
         y_offset = 10
-        for text in info_texts:
-            surface = self.font.render(text, True, self.TEXT_COLOR)
-            self.screen.blit(surface, (10, y_offset))
+        for row, text in enumerate(info_texts):
+            if row < len(self.info_cache) and self.info_cache[row][0] == text:
+                surface = self.info_cache[row][1]
+            else:
+                surface = self.font.render(text, True, self.TEXT_COLOR)
+                if row < len(self.info_cache):
+                    self.info_cache[row] = (text, surface)
+                else:
+                    self.info_cache.append((text, surface))
+            drawn.append(self.screen.blit(surface, (10, y_offset)))
             y_offset += 30
+        
+        return drawn
+    
+    def render_frame(self) -> List[pygame.Rect]:
+        """Redraw the changed parts of the screen, returning the dirty rectangles"""
+        dirty = list(self.prev_dirty)
+        
+        # Redraw holds whose status changed onto the cached wall
+        if self.changed_holds:
+            for hold_id in self.changed_holds:
+                area = self.hold_areas[hold_id]
+                self.redraw_wall_area(area)
+                dirty.append(area)
+            self.changed_holds.clear()
+        
+        # Restore the wall under last frame's skeleton/info and changed holds
+        for rect in dirty:
+            self.screen.blit(self.wall_surface, rect, rect)
+        
+        # Draw the overlays on top
+        drawn = self.draw_skeleton() + self.draw_info()
+        self.prev_dirty = [drawn[0].unionall(drawn[1:])] if drawn else []
+        
+        return dirty + self.prev_dirty
     
     async def connect_websocket(self):
         """Connect to WebSocket and listen for messages"""
@@ -379,17 +520,19 @@ class PoseVisualizer:
                 while self.running:
                     try:
                         message = await websocket.recv()
-                        data = json.loads(message)
+                        data = json_loads(message)
                         
                         # Update pose data
                         if 'pose' in data:
-                            self.current_pose = data['pose']
+                            self.set_pose(data['pose'])
                         
                         # Update session info
                         if 'session' in data:
                             self.session_info = data['session']
                             if 'holds' in data['session']:
-                                self.svg_parser.update_hold_status(data['session']['holds'])
+                                self.changed_holds.update(
+                                    self.svg_parser.update_hold_status(data['session']['holds'])
+                                )
                         
                         self.message_count += 1
                         self.last_update_time = time.time()
@@ -412,12 +555,20 @@ class PoseVisualizer:
         # Start WebSocket connection in background
         websocket_task = asyncio.create_task(self.connect_websocket())
         
+        # Frames are paced with asyncio.sleep rather than clock.tick(fps),
+        # which blocks and would starve the WebSocket task
+        frame_interval = 1.0 / self.fps
+        next_frame = time.monotonic()
+        
         try:
             while self.running:
                 # Handle pygame events
                 for event in pygame.event.get():
                     if event.type == pygame.QUIT:
                         self.running = False
+                    elif event.type == pygame.VIDEOEXPOSE:
+                        # Window contents were lost; repaint all of it
+                        self.prev_dirty.append(self.screen.get_rect())
                     elif event.type == pygame.KEYDOWN:
                         if event.key == pygame.K_ESCAPE:
                             self.running = False
@@ -426,17 +577,17 @@ class PoseVisualizer:
                             print("\n=== Current Session Info ===")
                             print(json.dumps(self.session_info, indent=2))
                 
-                # Clear screen
-                self.screen.fill(self.BG_COLOR)
-                
-                # Draw everything
-                self.draw_holds()
-                self.draw_skeleton()
-                self.draw_info()
+                # Draw and push only the changed regions to the display
+                pygame.display.update(self.render_frame())
+                self.clock.tick()  # Only tracks FPS for the info panel
                 
-                # Update display
-                pygame.display.flip()
-                self.clock.tick(self.fps)
+                next_frame += frame_interval
+                delay = next_frame - time.monotonic()
+                if delay < 0:
+                    # Running behind; don't try to catch up with a burst of frames
+                    next_frame = time.monotonic()
+                    delay = 0
+                await asyncio.sleep(delay)
                 
         except KeyboardInterrupt:
             print("\nInterrupted by user")
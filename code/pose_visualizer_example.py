@@ -8,8 +8,9 @@ This example shows how to set up the complete pipeline:
 """
 
 import asyncio
+import signal
 import subprocess
-import time
+import threading
 import sys
 import os
 
@@ -26,6 +27,8 @@ def print_banner():
     print("- Django project configured and running")
     print("- Wall with calibration in database")
     print("- Input WebSocket streaming pose data")
+    print("- Optional: orjson, used automatically by pose_visualizer.py")
+    print("  to decode the per-frame pose messages")
     print()
     print("Example workflow:")
     print("1. Start pose detector or pose streamer")
@@ -56,6 +59,9 @@ def example_commands():
     print("     --websocket-url ws://localhost:8000 \\")
     print("     --wall-svg path/to/your/wall.svg")
     print()
+    print("Optional, for faster pose message decoding in the visualizer:")
+    print("   uv pip install orjson")
+    print()
     print("Or use the demo script:")
     print("   ./run_pose_visualizer_demo.sh")
     print()
@@ -104,8 +110,12 @@ def main():
         print("Press Ctrl+C to exit")
         
         try:
-            while True:
-                time.sleep(1)
+            # Block until Ctrl+C without waking up periodically
+            if hasattr(signal, "pause"):
+                signal.pause()
+            else:
+                # Windows has no signal.pause()
+                threading.Event().wait()
         except KeyboardInterrupt:
             print("\nGoodbye!")
 
@@ -6,6 +6,7 @@ Simple test to verify file input functionality
 import subprocess
 import sys
 import os
+import threading
 
 def test_without_loop():
     """Test file input without looping"""
@@ -19,24 +20,30 @@ def test_without_loop():
     print("Running: python pose_streamer.py --file data/bolder2.mov")
     print("This should exit after the video completes.\n")
     
-    # Run the command and wait for it to complete
-    result = subprocess.run(
-        [sys.executable, "pose_streamer.py", "--file", video_file],
-        capture_output=True,
+    # Run the command and stream its output (unbuffered, stderr merged) as it
+    # arrives instead of capturing it all in memory
+    process = subprocess.Popen(
+        [sys.executable, "-u", "pose_streamer.py", "--file", video_file],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
         text=True,
-        timeout=30  # Maximum 30 seconds wait
+        bufsize=1
     )
     
-    print(f"Return code: {result.returncode}")
-    if result.stdout:
-        print("STDOUT:")
-        print(result.stdout)
-    if result.stderr:
-        print("STDERR:")
-        print(result.stderr)
+    # Maximum 30 seconds wait
+    timer = threading.Timer(30, process.kill)
+    timer.start()
+    try:
+        for line in process.stdout:
+            print(line, end='')
+    finally:
+        timer.cancel()
+    returncode = process.wait()
+    
+    print(f"Return code: {returncode}")
     
     # Check if it exited normally (return code 0) or was interrupted (return code 130 for Ctrl+C)
-    if result.returncode in [0, 130]:
+    if returncode in [0, 130]:
         print("\n✓ Test passed: Streamer exited after video completion")
         return True
     else:
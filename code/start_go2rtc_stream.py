@@ -14,11 +14,31 @@ import json
 import argparse
 import sys
 import os
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+
+# orjson is optional; both backends produce the UTF-8 bytes sent as the body
+try:
+    import orjson
+    json_dumps = orjson.dumps
+except ImportError:
+    def json_dumps(obj):
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# One keep-alive session for all go2rtc API calls. Connection attempts are
+# retried briefly so a go2rtc that is still starting up is not reported as down.
+_SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(pool_connections=1, pool_maxsize=4,
+                       max_retries=Retry(total=3, backoff_factor=0.2))
+_SESSION.mount("http://", _ADAPTER)
+_SESSION.mount("https://", _ADAPTER)
 
 def check_go2rtc_running(go2rtc_url="http://localhost:1984"):
     """Check if go2rtc is running."""
     try:
-        response = requests.get(f"{go2rtc_url}/api/info", timeout=2)
+        response = _SESSION.get(f"{go2rtc_url}/api/info", timeout=2)
         return response.status_code == 200
     except (requests.ConnectionError, requests.Timeout):
         return False
@@ -29,9 +49,10 @@ def configure_camera_stream(go2rtc_url="http://localhost:1984", camera_source="0
     stream_config = f"ffmpeg:{camera_source}?input_format=mjpeg&video_size=1280x720&framerate=30"
     
     try:
-        response = requests.post(
+        response = _SESSION.post(
             f"{go2rtc_url}/api/streams",
-            json={"name": stream_name, "src": stream_config},
+            data=json_dumps({"name": stream_name, "src": stream_config}),
+            headers=JSON_HEADERS,
             timeout=5
         )
         if response.status_code == 200:
@@ -47,8 +68,9 @@ def configure_camera_stream(go2rtc_url="http://localhost:1984", camera_source="0
 def start_video_streamer(script_path="video_go2rtc.py", camera_source="0"):
     """Start the video streamer script."""
     try:
-        cmd = ["python", script_path, "--source", camera_source]
-        process = subprocess.Popen(cmd)
+        cmd = [sys.executable, script_path, "--source", camera_source]
+        # Own session so Ctrl+C reaches only this script, which then stops the streamer
+        process = subprocess.Popen(cmd, start_new_session=True)
         print(f"Started video streamer with PID: {process.pid}")
         return process
     except Exception as e:
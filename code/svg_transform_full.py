@@ -1,203 +1,269 @@
 
-import xml.etree.ElementTree as ET
 import re
+import shutil
+from collections import namedtuple
+from functools import lru_cache
 import numpy as np
 
+# lxml walks and serializes the tree in C; fall back to the standard library
+try:
+    from lxml import etree as ET
+    HAVE_LXML = True
+except ImportError:
+    import xml.etree.ElementTree as ET
+    HAVE_LXML = False
+
+# Patterns used for every element/path, compiled once
+MATRIX_RE = re.compile(r'matrix\(([-\d.e\s,]+)\)')
+MATRIX_VALUE_RE = re.compile(r'[-\d.e]+')
+PATH_TOKEN_RE = re.compile(r'[MmLlHhVvCcSsQqTtAaZz]|[-+]?[0-9]*\.?[0-9]+(?:[eE][-+]?[0-9]+)?')
+
+# SVG matrix(a, b, c, d, e, f), i.e. the 3x3 matrix
+# | a c e |
+# | b d f |
+# | 0 0 1 |
+Affine = namedtuple('Affine', 'a b c d e f')
+IDENTITY = Affine(1.0, 0.0, 0.0, 1.0, 0.0, 0.0)
+
 def parse_transform_matrix(transform_str):
-    """Parse a transform attribute to extract the matrix values."""
-    matrix_match = re.search(r'matrix\(([-\d.e\s,]+)\)', transform_str)
+    """Parse a transform attribute to extract the matrix values as an Affine."""
+    matrix_match = MATRIX_RE.search(transform_str)
     if matrix_match:
-        values = [float(x) for x in re.findall(r'[-\d.e]+', matrix_match.group(1))]
+        values = [float(x) for x in MATRIX_VALUE_RE.findall(matrix_match.group(1))]
         if len(values) == 6:
-            return np.array([
-                [values[0], values[2], values[4]],
-                [values[1], values[3], values[5]],
-                [0, 0, 1]
-            ])
+            return Affine(*values)
     return None
 
-def invert_matrix(matrix):
-    """Invert a 3x3 transformation matrix."""
+# Inverses are cached by matrix values, so batches of SVGs sharing one
+# calibration only invert it once
+@lru_cache(maxsize=64)
+def _inverse_matrix(rows):
     try:
-        return np.linalg.inv(matrix)
+        return tuple(map(tuple, np.linalg.inv(np.array(rows)).tolist()))
     except np.linalg.LinAlgError:
+        return None
+
+@lru_cache(maxsize=64)
+def _inverse_affine(affine):
+    a, b, c, d, e, f = affine
+    det = a * d - b * c
+    if abs(det) < 1e-12:
+        return None
+    return Affine(d / det, -b / det, -c / det, a / det,
+                  (c * f - d * e) / det, (b * e - a * f) / det)
+
+def invert_matrix(matrix):
+    """Invert a 3x3 transformation matrix."""
+    inverse = _inverse_matrix(tuple(map(tuple, np.asarray(matrix, dtype=np.float64).tolist())))
+    if inverse is None:
         print("Warning: Matrix is singular and cannot be inverted!")
         return None
+    return np.array(inverse)
+
+def invert_affine(affine):
+    """Invert an Affine analytically."""
+    inverse = _inverse_affine(Affine(*map(float, affine)))
+    if inverse is None:
+        print("Warning: Matrix is singular and cannot be inverted!")
+    return inverse
 
-def transform_point(point, matrix):
-    """Transform a 2D point using a 3x3 transformation matrix."""
+def affine_coefficients(matrix):
+    """Return the affine part of a 3x3 transformation matrix as an Affine of floats."""
+    (a, c, e), (b, d, f) = np.asarray(matrix, dtype=np.float64)[:2].tolist()
+    return Affine(a, b, c, d, e, f)
+
+def transform_point(point, affine):
+    """Transform a 2D point using affine coefficients from affine_coefficients()."""
     x, y = point
-    homogeneous = np.array([x, y, 1])
-    transformed = matrix @ homogeneous
-    return transformed[0], transformed[1]
+    a, b, c, d, e, f = affine
+    return a * x + c * y + e, b * x + d * y + f
 
 def parse_path_data(path_d):
     """Parse SVG path data into commands and coordinates."""
     # Split path data into tokens
-    tokens = re.findall(r'[MmLlHhVvCcSsQqTtAaZz]|[-+]?[0-9]*\.?[0-9]+(?:[eE][-+]?[0-9]+)?', path_d)
+    tokens = PATH_TOKEN_RE.findall(path_d)
     return tokens
 
-def transform_path_data(path_d, matrix):
+# Number of (x, y) coordinate pairs taken by each path command
+PATH_COMMAND_PAIRS = {'M': 1, 'L': 1, 'T': 1, 'C': 3, 'S': 2, 'Q': 2, 'A': 1}
+
+def transform_points(points, affine):
+    """Transform an (N, 2) array of 2D points using an Affine."""
+    a, b, c, d, e, f = affine
+    if b == 0.0 and c == 0.0 and a == d:
+        # Pure translation or uniform scale: no 2x2 matmul needed
+        if a == 1.0:
+            return points + (e, f)
+        return points * a + (e, f)
+    return points @ np.array([[a, b], [c, d]]) + np.array([e, f])
+
+def transform_path_data(path_d, affine):
     """Transform all coordinates in a path data string."""
     tokens = parse_path_data(path_d)
-    result = []
-    i = 0
-    current_pos = [0, 0]
     
+    # Pass 1: find the commands and collect every coordinate pair that does not
+    # depend on the current position (absolute points and arc radii), so they
+    # can be transformed in one NumPy operation
+    commands = []
+    absolute_pairs = []
+    i = 0
     while i < len(tokens):
-        token = tokens[i]
+        cmd = tokens[i]
+        i += 1
+        if cmd not in 'MmLlHhVvCcSsQqTtAaZz':
+            continue
+        commands.append((cmd, i))
         
-        # Check if token is a command
-        if token in 'MmLlHhVvCcSsQqTtAaZz':
-            cmd = token
-            result.append(cmd)
+        upper = cmd.upper()
+        if upper == 'Z':
+            continue
+        elif upper in 'HV':
             i += 1
+        elif upper == 'A':
+            # Radii are transformed as points (approximate - doesn't handle skew perfectly)
+            absolute_pairs.append((float(tokens[i]), 0.0))
+            absolute_pairs.append((0.0, float(tokens[i+1])))
+            if cmd == 'A':
+                absolute_pairs.append((float(tokens[i+5]), float(tokens[i+6])))
+            i += 7
+        else:
+            if cmd == upper:
+                for j in range(PATH_COMMAND_PAIRS[upper]):
+                    absolute_pairs.append((float(tokens[i + j*2]), float(tokens[i + j*2 + 1])))
+            i += PATH_COMMAND_PAIRS[upper] * 2
+    
+    transformed = transform_points(np.array(absolute_pairs, dtype=np.float64).reshape(-1, 2), affine)
+    # Format them all with one %-format over the flat buffer, then pair each
+    # transformed point with its formatted strings
+    flat = transformed.ravel().tolist()
+    formatted = iter((' '.join(['%.6f'] * len(flat)) % tuple(flat)).split(' ') if flat else [])
+    transformed = zip(transformed.tolist(), zip(formatted, formatted))
+    
+    # Pass 2: emit the transformed path. Relative coordinates build on the
+    # transformed current position, so they are transformed as they come.
+    result = []
+    cx, cy = 0, 0
+    for cmd, i in commands:
+        result.append(cmd)
+        upper = cmd.upper()
+        relative = cmd != upper
+        
+        if upper == 'Z':
+            # Close path - no coordinates
+            continue
+        elif upper == 'H':
+            # Horizontal line - 1 coordinate (x)
+            x = float(tokens[i])
+            if relative:
+                x = cx + x
+            tx, ty = transform_point((x, cy), affine)
+            if relative:
+                tx = tx - cx
+            result.append(f'{tx:.6f}')
+            cx = cx + tx if relative else tx
+        elif upper == 'V':
+            # Vertical line - 1 coordinate (y)
+            y = float(tokens[i])
+            if relative:
+                y = cy + y
+            tx, ty = transform_point((cx, y), affine)
+            if relative:
+                ty = ty - cy
+            result.append(f'{ty:.6f}')
+            cy = cy + ty if relative else ty
+        else:
+            if upper == 'A':
+                # Arc - 7 values (rx, ry, rotation, large-arc, sweep, x, y)
+                _, (trx, _) = next(transformed)
+                _, (_, try_) = next(transformed)
+                result.extend([trx.lstrip('-'), try_.lstrip('-'),
+                               f'{float(tokens[i+2])}', tokens[i+3], tokens[i+4]])
+                i += 5
             
-            # Handle different path commands
-            if cmd in 'Zz':
-                # Close path - no coordinates
-                continue
-            elif cmd in 'Mm':
-                # MoveTo - 2 coordinates (x, y)
-                x, y = float(tokens[i]), float(tokens[i+1])
-                if cmd == 'm':  # relative
-                    x, y = current_pos[0] + x, current_pos[1] + y
-                tx, ty = transform_point((x, y), matrix)
-                if cmd == 'm':  # convert back to relative
-                    tx, ty = tx - current_pos[0], ty - current_pos[1]
-                result.extend([f'{tx:.6f}', f'{ty:.6f}'])
-                current_pos = [tx if cmd == 'M' else current_pos[0] + tx,
-                              ty if cmd == 'M' else current_pos[1] + ty]
-                i += 2
-            elif cmd in 'Ll':
-                # LineTo - 2 coordinates (x, y)
-                x, y = float(tokens[i]), float(tokens[i+1])
-                if cmd == 'l':
-                    x, y = current_pos[0] + x, current_pos[1] + y
-                tx, ty = transform_point((x, y), matrix)
-                if cmd == 'l':
-                    tx, ty = tx - current_pos[0], ty - current_pos[1]
-                result.extend([f'{tx:.6f}', f'{ty:.6f}'])
-                current_pos = [tx if cmd == 'L' else current_pos[0] + tx,
-                              ty if cmd == 'L' else current_pos[1] + ty]
-                i += 2
-            elif cmd in 'Hh':
-                # Horizontal line - 1 coordinate (x)
-                x = float(tokens[i])
-                if cmd == 'h':
-                    x = current_pos[0] + x
-                tx, ty = transform_point((x, current_pos[1]), matrix)
-                if cmd == 'h':
-                    tx = tx - current_pos[0]
-                result.append(f'{tx:.6f}')
-                current_pos[0] = tx if cmd == 'H' else current_pos[0] + tx
-                i += 1
-            elif cmd in 'Vv':
-                # Vertical line - 1 coordinate (y)
-                y = float(tokens[i])
-                if cmd == 'v':
-                    y = current_pos[1] + y
-                tx, ty = transform_point((current_pos[0], y), matrix)
-                if cmd == 'v':
-                    ty = ty - current_pos[1]
-                result.append(f'{ty:.6f}')
-                current_pos[1] = ty if cmd == 'V' else current_pos[1] + ty
-                i += 1
-            elif cmd in 'Cc':
-                # Cubic Bezier - 6 coordinates (x1, y1, x2, y2, x, y)
-                coords = []
-                for j in range(3):
-                    x, y = float(tokens[i + j*2]), float(tokens[i + j*2 + 1])
-                    if cmd == 'c':
-                        x, y = current_pos[0] + x, current_pos[1] + y
-                    tx, ty = transform_point((x, y), matrix)
-                    if cmd == 'c':
-                        tx, ty = tx - current_pos[0], ty - current_pos[1]
+            # M, L, T, A: 1 pair; S, Q: 2 pairs; C: 3 pairs
+            coords = []
+            for j in range(PATH_COMMAND_PAIRS[upper]):
+                if relative:
+                    x = cx + float(tokens[i + j*2])
+                    y = cy + float(tokens[i + j*2 + 1])
+                    tx, ty = transform_point((x, y), affine)
+                    tx, ty = tx - cx, ty - cy
                     coords.extend([f'{tx:.6f}', f'{ty:.6f}'])
-                result.extend(coords)
-                if cmd == 'C':
-                    current_pos = [float(coords[-2]), float(coords[-1])]
                 else:
-                    current_pos = [current_pos[0] + float(coords[-2]), 
-                                  current_pos[1] + float(coords[-1])]
-                i += 6
-            elif cmd in 'Ss':
-                # Smooth cubic Bezier - 4 coordinates (x2, y2, x, y)
-                coords = []
-                for j in range(2):
-                    x, y = float(tokens[i + j*2]), float(tokens[i + j*2 + 1])
-                    if cmd == 's':
-                        x, y = current_pos[0] + x, current_pos[1] + y
-                    tx, ty = transform_point((x, y), matrix)
-                    if cmd == 's':
-                        tx, ty = tx - current_pos[0], ty - current_pos[1]
-                    coords.extend([f'{tx:.6f}', f'{ty:.6f}'])
-                result.extend(coords)
-                if cmd == 'S':
-                    current_pos = [float(coords[-2]), float(coords[-1])]
-                else:
-                    current_pos = [current_pos[0] + float(coords[-2]), 
-                                  current_pos[1] + float(coords[-1])]
-                i += 4
-            elif cmd in 'Qq':
-                # Quadratic Bezier - 4 coordinates (x1, y1, x, y)
-                coords = []
-                for j in range(2):
-                    x, y = float(tokens[i + j*2]), float(tokens[i + j*2 + 1])
-                    if cmd == 'q':
-                        x, y = current_pos[0] + x, current_pos[1] + y
-                    tx, ty = transform_point((x, y), matrix)
-                    if cmd == 'q':
-                        tx, ty = tx - current_pos[0], ty - current_pos[1]
-                    coords.extend([f'{tx:.6f}', f'{ty:.6f}'])
-                result.extend(coords)
-                if cmd == 'Q':
-                    current_pos = [float(coords[-2]), float(coords[-1])]
-                else:
-                    current_pos = [current_pos[0] + float(coords[-2]), 
-                                  current_pos[1] + float(coords[-1])]
-                i += 4
-            elif cmd in 'Tt':
-                # Smooth quadratic Bezier - 2 coordinates (x, y)
-                x, y = float(tokens[i]), float(tokens[i+1])
-                if cmd == 't':
-                    x, y = current_pos[0] + x, current_pos[1] + y
-                tx, ty = transform_point((x, y), matrix)
-                if cmd == 't':
-                    tx, ty = tx - current_pos[0], ty - current_pos[1]
-                result.extend([f'{tx:.6f}', f'{ty:.6f}'])
-                current_pos = [tx if cmd == 'T' else current_pos[0] + tx,
-                              ty if cmd == 'T' else current_pos[1] + ty]
-                i += 2
-            elif cmd in 'Aa':
-                # Arc - 7 values (rx, ry, rotation, large-arc, sweep, x, y)
-                rx, ry = float(tokens[i]), float(tokens[i+1])
-                rotation = float(tokens[i+2])
-                large_arc = tokens[i+3]
-                sweep = tokens[i+4]
-                x, y = float(tokens[i+5]), float(tokens[i+6])
-                
-                # Transform radii (approximate - doesn't handle skew perfectly)
-                trx, _ = transform_point((rx, 0), matrix)
-                _, try_ = transform_point((0, ry), matrix)
-                
-                if cmd == 'a':
-                    x, y = current_pos[0] + x, current_pos[1] + y
-                tx, ty = transform_point((x, y), matrix)
-                if cmd == 'a':
-                    tx, ty = tx - current_pos[0], ty - current_pos[1]
-                
-                result.extend([f'{abs(trx):.6f}', f'{abs(try_):.6f}', 
-                              f'{rotation}', large_arc, sweep,
-                              f'{tx:.6f}', f'{ty:.6f}'])
-                current_pos = [tx if cmd == 'A' else current_pos[0] + tx,
-                              ty if cmd == 'A' else current_pos[1] + ty]
-                i += 7
-        else:
-            i += 1
+                    (tx, ty), formatted_pair = next(transformed)
+                    coords.extend(formatted_pair)
+            result.extend(coords)
+            
+            # Bezier commands continue from the formatted end point
+            if upper in 'CSQ':
+                tx, ty = float(coords[-2]), float(coords[-1])
+            if relative:
+                cx += tx
+                cy += ty
+            else:
+                cx, cy = tx, ty
     
     return ' '.join(result)
 
+def _transform_path_element(elem, affine):
+    d = elem.get('d')
+    if not d:
+        return False
+    elem.set('d', transform_path_data(d, affine))
+    return True
+
+def _transform_center_element(elem, affine):
+    # circle and ellipse
+    cx, cy = float(elem.get('cx', 0)), float(elem.get('cy', 0))
+    tx, ty = transform_point((cx, cy), affine)
+    elem.set('cx', f'{tx:.6f}')
+    elem.set('cy', f'{ty:.6f}')
+    return True
+
+def _transform_rect_element(elem, affine):
+    x, y = float(elem.get('x', 0)), float(elem.get('y', 0))
+    tx, ty = transform_point((x, y), affine)
+    elem.set('x', f'{tx:.6f}')
+    elem.set('y', f'{ty:.6f}')
+    return True
+
+def _transform_line_element(elem, affine):
+    x1, y1 = float(elem.get('x1', 0)), float(elem.get('y1', 0))
+    x2, y2 = float(elem.get('x2', 0)), float(elem.get('y2', 0))
+    tx1, ty1 = transform_point((x1, y1), affine)
+    tx2, ty2 = transform_point((x2, y2), affine)
+    elem.set('x1', f'{tx1:.6f}')
+    elem.set('y1', f'{ty1:.6f}')
+    elem.set('x2', f'{tx2:.6f}')
+    elem.set('y2', f'{ty2:.6f}')
+    return True
+
+def _transform_points_element(elem, affine):
+    # polygon and polyline
+    points = elem.get('points', '').replace(',', ' ').strip()
+    if not points:
+        elem.set('points', '')
+        return True
+    coords = np.fromstring(points, dtype=np.float64, sep=' ').reshape(-1, 2)
+    transformed = transform_points(coords, affine)
+    # One format string over all values instead of an f-string per vertex
+    point_format = ' '.join(['%.6f,%.6f'] * len(transformed))
+    elem.set('points', point_format % tuple(transformed.ravel().tolist()))
+    return True
+
+# Element transform handlers by local tag name (namespace stripped). Each takes
+# the element and the Affine to apply and returns whether the element was
+# transformed.
+ELEMENT_TRANSFORMS = {
+    'path': _transform_path_element,
+    'circle': _transform_center_element,
+    'ellipse': _transform_center_element,
+    'rect': _transform_rect_element,
+    'line': _transform_line_element,
+    'polygon': _transform_points_element,
+    'polyline': _transform_points_element,
+}
+
 def apply_inverse_transform_to_paths(svg_file, output_file, transform_matrix):
     """
     Apply inverse transformation to all path coordinates in an SVG file.
@@ -205,17 +271,22 @@ def apply_inverse_transform_to_paths(svg_file, output_file, transform_matrix):
     Args:
         svg_file: Path to input SVG file
         output_file: Path to output SVG file
-        transform_matrix: 3x3 numpy array
+        transform_matrix: Affine or 3x3 numpy array (only its affine part is applied
+            after inversion)
     """
     # Parse SVG
     tree = ET.parse(svg_file)
     root = tree.getroot()
     
-    # Define SVG namespace
-    ET.register_namespace('', 'http://www.w3.org/2000/svg')
+    # Define SVG namespace (lxml keeps the document's own prefixes)
+    if not HAVE_LXML:
+        ET.register_namespace('', 'http://www.w3.org/2000/svg')
     
     # Invert the matrix
-    inverse_matrix = invert_matrix(transform_matrix)
+    if isinstance(transform_matrix, Affine):
+        inverse_matrix = invert_affine(transform_matrix)
+    else:
+        inverse_matrix = invert_matrix(transform_matrix)
     
     if inverse_matrix is None:
         print("Cannot proceed with singular matrix.")
@@ -226,62 +297,35 @@ def apply_inverse_transform_to_paths(svg_file, output_file, transform_matrix):
     print("\nInverse matrix:")
     print(inverse_matrix)
     
-    # Find and transform all path elements
+    if isinstance(inverse_matrix, Affine):
+        affine = inverse_matrix
+    else:
+        affine = affine_coefficients(inverse_matrix)
+    
+    # Identity transform: nothing to change, copy the file as is
+    if np.allclose(affine, IDENTITY, rtol=0, atol=1e-9):
+        shutil.copyfile(svg_file, output_file)
+        print("\nIdentity transform, file copied unchanged")
+        print(f"Output saved to: {output_file}")
+        return
+    
+    # Find and transform all path and shape elements
+    if HAVE_LXML:
+        # libxml2 filters the shape tags (in any namespace) in C
+        elements = root.iter(*[f'{{*}}{tag}' for tag in ELEMENT_TRANSFORMS])
+    else:
+        elements = root.iter()
     paths_transformed = 0
-    for elem in root.iter():
-        # Handle path elements
-        if elem.tag.endswith('path'):
-            d = elem.get('d')
-            if d:
-                transformed_d = transform_path_data(d, inverse_matrix)
-                elem.set('d', transformed_d)
-                paths_transformed += 1
-        
-        # Also handle other shape elements with coordinates
-        elif elem.tag.endswith('circle'):
-            cx, cy = float(elem.get('cx', 0)), float(elem.get('cy', 0))
-            tx, ty = transform_point((cx, cy), inverse_matrix)
-            elem.set('cx', f'{tx:.6f}')
-            elem.set('cy', f'{ty:.6f}')
-            paths_transformed += 1
-        
-        elif elem.tag.endswith('ellipse'):
-            cx, cy = float(elem.get('cx', 0)), float(elem.get('cy', 0))
-            tx, ty = transform_point((cx, cy), inverse_matrix)
-            elem.set('cx', f'{tx:.6f}')
-            elem.set('cy', f'{ty:.6f}')
-            paths_transformed += 1
-        
-        elif elem.tag.endswith('rect'):
-            x, y = float(elem.get('x', 0)), float(elem.get('y', 0))
-            tx, ty = transform_point((x, y), inverse_matrix)
-            elem.set('x', f'{tx:.6f}')
-            elem.set('y', f'{ty:.6f}')
-            paths_transformed += 1
-        
-        elif elem.tag.endswith('line'):
-            x1, y1 = float(elem.get('x1', 0)), float(elem.get('y1', 0))
-            x2, y2 = float(elem.get('x2', 0)), float(elem.get('y2', 0))
-            tx1, ty1 = transform_point((x1, y1), inverse_matrix)
-            tx2, ty2 = transform_point((x2, y2), inverse_matrix)
-            elem.set('x1', f'{tx1:.6f}')
-            elem.set('y1', f'{ty1:.6f}')
-            elem.set('x2', f'{tx2:.6f}')
-            elem.set('y2', f'{ty2:.6f}')
-            paths_transformed += 1
-        
-        elif elem.tag.endswith('polygon') or elem.tag.endswith('polyline'):
-            points = elem.get('points', '')
-            coords = [float(x) for x in re.findall(r'[-+]?[0-9]*\.?[0-9]+', points)]
-            transformed_points = []
-            for i in range(0, len(coords), 2):
-                tx, ty = transform_point((coords[i], coords[i+1]), inverse_matrix)
-                transformed_points.append(f'{tx:.6f},{ty:.6f}')
-            elem.set('points', ' '.join(transformed_points))
+    for elem in elements:
+        handler = ELEMENT_TRANSFORMS.get(elem.tag.rpartition('}')[2])
+        if handler and handler(elem, affine):
             paths_transformed += 1
     
     # Save the modified SVG
-    tree.write(output_file, encoding='unicode', xml_declaration=True)
+    if HAVE_LXML:
+        tree.write(output_file, encoding='utf-8', xml_declaration=True)
+    else:
+        tree.write(output_file, encoding='unicode', xml_declaration=True)
     print(f"\nTransformed {paths_transformed} elements")
     print(f"Output saved to: {output_file}")
 
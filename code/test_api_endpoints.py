@@ -10,7 +10,9 @@ import sys
 import django
 import json
 import requests
+from requests.adapters import HTTPAdapter
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 # Setup Django
@@ -19,35 +21,42 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'app.settings')
 django.setup()
 
 from django.contrib.auth.models import User
-from climber.models import Wall, CeleryTask
+from climber.models import Wall, Route, CeleryTask
 
 # Configuration
 BASE_URL = 'http://localhost:8000'
 API_BASE = f'{BASE_URL}/api'
+# Set TEST_VERBOSE=1 to pretty-print task parameters as JSON
+VERBOSE = os.environ.get('TEST_VERBOSE') == '1'
 
-def test_start_default_task():
+# All requests go over one keep-alive session instead of a new connection each
+SESSION = requests.Session()
+SESSION.mount('http://', HTTPAdapter(pool_connections=4, pool_maxsize=8))
+
+def format_parameters(parameters):
+    """Format task parameters for printing, as indented JSON in verbose mode"""
+    return json.dumps(parameters, indent=2) if VERBOSE else parameters
+
+def test_start_default_task(test_route):
     """Test the start_default_task endpoint"""
     print("\n=== Testing Start Default Task Endpoint ===")
     
     try:
-        # Get a route ID for testing
-        from climber.models import Route
-        test_route = Route.objects.first()
         if not test_route:
             print("❌ No routes found. Please create a route first.")
             return None
         
         # Test with minimal required parameters
-        response = requests.post(f'{API_BASE}/tasks/start-default/', json={'route_id': test_route.id})
+        response = SESSION.post(f'{API_BASE}/tasks/start-default/', json={'route_id': test_route.id})
         
         print(f"Status Code: {response.status_code}")
-        print(f"Response: {response.json()}")
+        data = response.json()
+        print(f"Response: {data}")
         
         if response.status_code == 200:
-            data = response.json()
             if data.get('status') == 'success':
                 print(f"✅ Task started successfully with ID: {data.get('task_id')}")
-                print(f"📋 Parameters used: {json.dumps(data.get('parameters'), indent=2)}")
+                print(f"📋 Parameters used: {format_parameters(data.get('parameters'))}")
                 return data.get('task_id')
             else:
                 print(f"❌ Error: {data.get('message')}")
@@ -59,14 +68,11 @@ def test_start_default_task():
     
     return None
 
-def test_start_default_task_with_params():
+def test_start_default_task_with_params(test_route):
     """Test the start_default_task endpoint with custom parameters"""
     print("\n=== Testing Start Default Task with Custom Parameters ===")
     
     try:
-        # Get a route ID for testing
-        from climber.models import Route
-        test_route = Route.objects.first()
         if not test_route:
             print("❌ No routes found. Please create a route first.")
             return None
@@ -79,16 +85,16 @@ def test_start_default_task_with_params():
             'touch_duration': 1.5
         }
         
-        response = requests.post(f'{API_BASE}/tasks/start-default/', json=custom_params)
+        response = SESSION.post(f'{API_BASE}/tasks/start-default/', json=custom_params)
         
         print(f"Status Code: {response.status_code}")
-        print(f"Response: {response.json()}")
+        data = response.json()
+        print(f"Response: {data}")
         
         if response.status_code == 200:
-            data = response.json()
             if data.get('status') == 'success':
                 print(f"✅ Task started successfully with ID: {data.get('task_id')}")
-                print(f"📋 Parameters used: {json.dumps(data.get('parameters'), indent=2)}")
+                print(f"📋 Parameters used: {format_parameters(data.get('parameters'))}")
                 return data.get('task_id')
             else:
                 print(f"❌ Error: {data.get('message')}")
@@ -100,18 +106,29 @@ def test_start_default_task_with_params():
     
     return None
 
-def test_get_running_tasks():
-    """Test getting running tasks before and after starting"""
+def test_get_running_tasks(until=None, timeout=5, interval=0.1):
+    """Test getting running tasks before and after starting.
+    
+    If until is given, polls every interval seconds until until(tasks) is true
+    or timeout seconds have passed. Also serves as the server liveness check:
+    exits if the server cannot be reached.
+    """
     print("\n=== Testing Get Running Tasks ===")
     
     try:
-        response = requests.get(f'{API_BASE}/tasks/running/')
+        deadline = time.monotonic() + timeout
+        while True:
+            response = SESSION.get(f'{API_BASE}/tasks/running/', timeout=5)
+            if response.status_code != 200:
+                break
+            tasks = response.json().get('tasks', [])
+            if until is None or until(tasks) or time.monotonic() >= deadline:
+                break
+            time.sleep(interval)
         
         print(f"Status Code: {response.status_code}")
         
         if response.status_code == 200:
-            data = response.json()
-            tasks = data.get('tasks', [])
             print(f"📊 Currently running tasks: {len(tasks)}")
             
             for task in tasks:
@@ -127,6 +144,10 @@ def test_get_running_tasks():
         else:
             print(f"❌ HTTP Error: {response.status_code}")
             
+    except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+        print("❌ Cannot connect to server. Make sure Django development server is running.")
+        print("   Run: uv run python manage.py runserver")
+        sys.exit(1)
     except Exception as e:
         print(f"❌ Exception: {e}")
     
@@ -137,13 +158,13 @@ def test_kill_all_tasks():
     print("\n=== Testing Kill All Tasks Endpoint ===")
     
     try:
-        response = requests.post(f'{API_BASE}/tasks/kill-all/')
+        response = SESSION.post(f'{API_BASE}/tasks/kill-all/')
         
         print(f"Status Code: {response.status_code}")
-        print(f"Response: {response.json()}")
+        data = response.json()
+        print(f"Response: {data}")
         
         if response.status_code == 200:
-            data = response.json()
             if data.get('status') == 'success':
                 killed_count = data.get('killed_count', 0)
                 print(f"✅ Successfully killed {killed_count} tasks")
@@ -163,7 +184,7 @@ def test_kill_all_tasks():
     except Exception as e:
         print(f"❌ Exception: {e}")
 
-def test_endpoint_without_walls():
+def test_endpoint_without_walls(test_route):
     """Test start_default_task when no walls exist"""
     print("\n=== Testing Start Task Without Walls ===")
     
@@ -172,24 +193,17 @@ def test_endpoint_without_walls():
     Wall.objects.all().delete()
     
     try:
-        # Get a route ID for testing
-        from climber.models import Route
-        test_route = Route.objects.first()
         if not test_route:
             print("❌ No routes found. Skipping this test.")
-            # Restore walls and return
-            for wall in original_walls:
-                wall.pk = None
-                wall.save()
             return
         
-        response = requests.post(f'{API_BASE}/tasks/start-default/', json={'route_id': test_route.id})
+        response = SESSION.post(f'{API_BASE}/tasks/start-default/', json={'route_id': test_route.id})
         
         print(f"Status Code: {response.status_code}")
-        print(f"Response: {response.json()}")
+        data = response.json()
+        print(f"Response: {data}")
         
         if response.status_code == 400:
-            data = response.json()
             if 'No walls available' in data.get('message', ''):
                 print("✅ Correctly handled case with no walls")
             else:
@@ -199,11 +213,11 @@ def test_endpoint_without_walls():
             
     except Exception as e:
         print(f"❌ Exception: {e}")
-    
-    # Restore walls
-    for wall in original_walls:
-        wall.pk = None  # Create new copy
-        wall.save()
+    finally:
+        # Restore walls as new copies in one INSERT
+        for wall in original_walls:
+            wall.pk = None
+        Wall.objects.bulk_create(original_walls)
 
 
 def test_endpoint_without_route_id():
@@ -211,13 +225,13 @@ def test_endpoint_without_route_id():
     print("\n=== Testing Start Task Without Route ID ===")
     
     try:
-        response = requests.post(f'{API_BASE}/tasks/start-default/', json={})
+        response = SESSION.post(f'{API_BASE}/tasks/start-default/', json={})
         
         print(f"Status Code: {response.status_code}")
-        print(f"Response: {response.json()}")
+        data = response.json()
+        print(f"Response: {data}")
         
         if response.status_code == 400:
-            data = response.json()
             if 'route_id is required' in data.get('message', ''):
                 print("✅ Correctly required route_id parameter")
             else:
@@ -230,52 +244,42 @@ def test_endpoint_without_route_id():
 
 def main():
     """Main test function"""
+    try:
+        run_tests()
+    finally:
+        SESSION.close()
+
+def run_tests():
+    """Run all endpoint tests against the running server"""
     print("🚀 Starting API Endpoint Tests")
     print(f"📍 Target URL: {BASE_URL}")
     
-    # Check if server is running
-    try:
-        response = requests.get(f'{BASE_URL}/', timeout=5)
-        if response.status_code != 200:
-            print("❌ Server is not responding correctly")
-            return
-    except requests.exceptions.RequestException:
-        print("❌ Cannot connect to server. Make sure Django development server is running.")
-        print("   Run: uv run python manage.py runserver")
-        return
-    
-    print("✅ Server is running\n")
-    
-    # Test 1: Get initial running tasks
+    # Test 1: Get initial running tasks (exits if the server is not running)
     initial_tasks = test_get_running_tasks()
     
-    # Test 2: Start task with defaults
-    task_id_1 = test_start_default_task()
+    # Route used by all tests that start a task
+    test_route = Route.objects.only('id').first()
     
-    # Test 3: Start task with custom parameters
-    task_id_2 = test_start_default_task_with_params()
+    # Test 2 and 3: Start task with defaults and with custom parameters.
+    # The two requests are independent, so send them concurrently.
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        future_1 = executor.submit(test_start_default_task, test_route)
+        future_2 = executor.submit(test_start_default_task_with_params, test_route)
+        task_id_1, task_id_2 = future_1.result(), future_2.result()
     
-    # Wait a moment for tasks to register
-    print("\n⏳ Waiting 2 seconds for tasks to register...")
-    time.sleep(2)
-    
-    # Test 4: Check running tasks after starting
+    # Test 4: Check running tasks once the new ones have registered
     print("\n📊 Checking running tasks after starting new ones:")
-    running_tasks = test_get_running_tasks()
+    running_tasks = test_get_running_tasks(until=lambda tasks: len(tasks) >= 2)
     
     # Test 5: Kill all tasks
     test_kill_all_tasks()
     
-    # Wait a moment for tasks to be killed
-    print("\n⏳ Waiting 2 seconds for tasks to be killed...")
-    time.sleep(2)
-    
-    # Test 6: Check running tasks after killing
+    # Test 6: Check running tasks once the killed ones are gone
     print("\n📊 Checking running tasks after killing all:")
-    final_tasks = test_get_running_tasks()
+    final_tasks = test_get_running_tasks(until=lambda tasks: not tasks)
     
     # Test 7: Test edge case with no walls
-    test_endpoint_without_walls()
+    test_endpoint_without_walls(test_route)
     
     # Test 8: Test missing route_id parameter
     test_endpoint_without_route_id()
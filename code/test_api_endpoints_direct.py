@@ -9,7 +9,8 @@ import os
 import sys
 import django
 import json
-from unittest.mock import Mock, MagicMock
+from contextlib import contextmanager
+from unittest.mock import MagicMock, patch
 
 # Setup Django
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
@@ -20,36 +21,41 @@ from django.contrib.auth.models import User
 from climber.models import Wall, Route, CeleryTask, Venue
 from climber.views import start_default_task, kill_all_tasks
 from rest_framework.test import APIRequestFactory
+from django.db import transaction
+
+# One request factory shared by all tests
+FACTORY = APIRequestFactory()
+
+@contextmanager
+def rolled_back():
+    """Run the block in a transaction that is always rolled back, so tests leave no data behind"""
+    with transaction.atomic():
+        yield
+        transaction.set_rollback(True)
 
 def test_start_default_task_direct():
     """Test start_default_task function directly"""
     print("\n=== Testing Start Default Task Function Directly ===")
     
     try:
-        # Create test data with venue (required for Wall)
-        test_venue = Venue.objects.create(name="Test Venue")
-        test_wall = Wall.objects.create(name="Test Wall", venue=test_venue)
-        test_route = Route.objects.create(name="Test Route")
-        
-        # Create mock request
-        factory = APIRequestFactory()
-        request = factory.post(
-            '/api/tasks/start-default/',
-            data={'route_id': test_route.id},
-            format='json'
-        )
-        
-        # Mock websocket_pose_session_tracker_task.delay to avoid actually starting a task
-        with Mock() as mock_task:
-            mock_task.id = 'test-task-id-123'
-            mock_task.return_value = mock_task
+        # Roll back everything the test writes
+        with rolled_back():
+            # Create test data with venue (required for Wall)
+            test_venue = Venue.objects.create(name="Test Venue")
+            test_wall = Wall.objects.create(name="Test Wall", venue=test_venue)
+            test_route = Route.objects.create(name="Test Route")
             
-            # Import and patch the task
-            from climber import views
-            original_task = views.websocket_pose_session_tracker_task
-            views.websocket_pose_session_tracker_task = mock_task
+            # Create mock request
+            request = FACTORY.post(
+                '/api/tasks/start-default/',
+                data={'route_id': test_route.id},
+                format='json'
+            )
             
-            try:
+            # Mock websocket_pose_session_tracker_task.delay to avoid actually starting a task
+            with patch('climber.views.websocket_pose_session_tracker_task') as mock_task:
+                mock_task.delay.return_value.id = 'test-task-id-123'
+                
                 # Call function
                 response = start_default_task(request)
                 
@@ -68,10 +74,7 @@ def test_start_default_task_direct():
                         print(f"❌ Error: {data.get('message')}")
                 else:
                     print(f"❌ HTTP Error: {response.status_code}")
-            finally:
-                # Restore original task
-                views.websocket_pose_session_tracker_task = original_task
-                
+                    
     except Exception as e:
         print(f"❌ Exception: {e}")
         return False
@@ -83,36 +86,37 @@ def test_start_default_task_without_route():
     print("\n=== Testing Start Task Without Route ID (Direct) ===")
     
     try:
-        # Create test data with venue (required for Wall)
-        test_venue = Venue.objects.create(name="Test Venue 2")
-        test_wall = Wall.objects.create(name="Test Wall 2", venue=test_venue)
-        
-        # Create mock request without route_id
-        factory = APIRequestFactory()
-        request = factory.post(
-            '/api/tasks/start-default/',
-            data={},
-            format='json'
-        )
-        
-        # Call the function
-        response = start_default_task(request)
-        
-        print(f"Response Status: {response.status_code}")
-        # Parse JSON from JsonResponse
-        response_data = json.loads(response.content)
-        print(f"Response Data: {response_data}")
-        
-        if response.status_code == 400:
-            data = response_data
-            if 'route_id is required' in data.get('message', ''):
-                print("✅ Correctly required route_id parameter")
-                return True
-            else:
-                print(f"❌ Unexpected error message: {data.get('message')}")
-        else:
-            print(f"❌ Expected 400 error, got {response.status_code}")
+        # Roll back everything the test writes
+        with rolled_back():
+            # Create test data with venue (required for Wall)
+            test_venue = Venue.objects.create(name="Test Venue 2")
+            test_wall = Wall.objects.create(name="Test Wall 2", venue=test_venue)
+            
+            # Create mock request without route_id
+            request = FACTORY.post(
+                '/api/tasks/start-default/',
+                data={},
+                format='json'
+            )
+            
+            # Call the function
+            response = start_default_task(request)
+            
+            print(f"Response Status: {response.status_code}")
+            # Parse JSON from JsonResponse
+            response_data = json.loads(response.content)
+            print(f"Response Data: {response_data}")
             
+            if response.status_code == 400:
+                data = response_data
+                if 'route_id is required' in data.get('message', ''):
+                    print("✅ Correctly required route_id parameter")
+                    return True
+                else:
+                    print(f"❌ Unexpected error message: {data.get('message')}")
+            else:
+                print(f"❌ Expected 400 error, got {response.status_code}")
+                
     except Exception as e:
         print(f"❌ Exception: {e}")
         return False
@@ -124,22 +128,21 @@ def test_start_default_task_without_walls():
     print("\n=== Testing Start Task Without Walls (Direct) ===")
     
     try:
-        # Create test data
-        test_route = Route.objects.create(name="Test Route 2")
-        
-        # Temporarily delete all walls
-        original_walls = list(Wall.objects.all())
-        Wall.objects.all().delete()
-        
-        # Create mock request
-        factory = APIRequestFactory()
-        request = factory.post(
-            '/api/tasks/start-default/',
-            data={'route_id': test_route.id},
-            format='json'
-        )
-        
-        try:
+        # Roll back everything the test writes
+        with rolled_back():
+            # Create test data
+            test_route = Route.objects.create(name="Test Route 2")
+            
+            # Delete all walls (the rollback brings them back)
+            Wall.objects.all().delete()
+            
+            # Create mock request
+            request = FACTORY.post(
+                '/api/tasks/start-default/',
+                data={'route_id': test_route.id},
+                format='json'
+            )
+            
             # Call the function
             response = start_default_task(request)
             
@@ -158,12 +161,6 @@ def test_start_default_task_without_walls():
             else:
                 print(f"❌ Expected 400 error, got {response.status_code}")
                 
-        finally:
-            # Restore walls
-            for wall in original_walls:
-                wall.pk = None  # Create new copy
-                wall.save()
-            
     except Exception as e:
         print(f"❌ Exception: {e}")
         return False
@@ -175,57 +172,50 @@ def test_kill_all_tasks_direct():
     print("\n=== Testing Kill All Tasks Function Directly ===")
     
     try:
-        # Create some mock task records
-        task1 = CeleryTask.objects.create(
-            task_id='test-task-1',
-            task_name='test_task_1',
-            status='PENDING'
-        )
-        task2 = CeleryTask.objects.create(
-            task_id='test-task-2',
-            task_name='test_task_2',
-            status='PROGRESS'
-        )
-        
-        # Create mock request
-        factory = APIRequestFactory()
-        request = factory.post('/api/tasks/kill-all/')
-        
-        # Mock AsyncResult to avoid actual Celery operations
-        mock_result = MagicMock()
-        mock_result.state = 'PENDING'
-        mock_result.revoke = MagicMock()
-        
-        # Import and patch AsyncResult
-        from celery.result import AsyncResult
-        original_result = AsyncResult
-        AsyncResult = MagicMock(return_value=mock_result)
-        
-        try:
-            # Call the function
-            response = kill_all_tasks(request)
+        # Roll back everything the test writes
+        with rolled_back():
+            # Create some mock task records in one INSERT
+            task1, task2 = CeleryTask.objects.bulk_create([
+                CeleryTask(
+                    task_id='test-task-1',
+                    task_name='test_task_1',
+                    status='PENDING'
+                ),
+                CeleryTask(
+                    task_id='test-task-2',
+                    task_name='test_task_2',
+                    status='PROGRESS'
+                ),
+            ])
             
-            print(f"Response Status: {response.status_code}")
-            # Parse JSON from JsonResponse
-            response_data = json.loads(response.content)
-            print(f"Response Data: {response_data}")
+            # Create mock request
+            request = FACTORY.post('/api/tasks/kill-all/')
             
-            if response.status_code == 200:
-                data = response_data
-                if data.get('status') == 'success':
-                    killed_count = data.get('killed_count', 0)
-                    print(f"✅ Successfully would kill {killed_count} tasks")
-                    return True
-                else:
-                    print(f"❌ Error: {data.get('message')}")
-            else:
-                print(f"❌ HTTP Error: {response.status_code}")
+            # Mock AsyncResult to avoid actual Celery operations. kill_all_tasks imports
+            # it from celery.result when called, so patch it there.
+            with patch('celery.result.AsyncResult') as mock_async_result:
+                mock_async_result.return_value.state = 'PENDING'
+                mock_async_result.return_value.revoke = MagicMock()
+                
+                # Call the function
+                response = kill_all_tasks(request)
                 
-        finally:
-            # Restore original AsyncResult
-            import celery.result
-            celery.result.AsyncResult = original_result
+                print(f"Response Status: {response.status_code}")
+                # Parse JSON from JsonResponse
+                response_data = json.loads(response.content)
+                print(f"Response Data: {response_data}")
                 
+                if response.status_code == 200:
+                    data = response_data
+                    if data.get('status') == 'success':
+                        killed_count = data.get('killed_count', 0)
+                        print(f"✅ Successfully would kill {killed_count} tasks")
+                        return True
+                    else:
+                        print(f"❌ Error: {data.get('message')}")
+                else:
+                    print(f"❌ HTTP Error: {response.status_code}")
+                    
     except Exception as e:
         print(f"❌ Exception: {e}")
         return False
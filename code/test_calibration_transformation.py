@@ -7,6 +7,7 @@ import os
 import sys
 import django
 import numpy as np
+from django.db.models import Prefetch
 
 # Setup Django
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
@@ -15,17 +16,32 @@ django.setup()
 
 from climber.models import Wall, WallCalibration
 
+def as_3x3_matrix(transform):
+    """Return the transform as a float32 3x3 array, or None if it is not a 3x3 matrix"""
+    try:
+        matrix = np.asarray(transform, dtype=np.float32)
+    except (ValueError, TypeError):
+        return None
+    return matrix if matrix.shape == (3, 3) else None
+
 def test_calibration_transformation():
     """Test that calibration transformation is being applied correctly"""
     
-    # Get a wall with calibrations
-    walls = Wall.objects.all()
-    
-    if not walls:
+    if not Wall.objects.exists():
         print("No walls found in database")
         return
     
-    for wall in walls:
+    # Stream the walls with all their calibrations fetched in one extra query,
+    # loading only the fields used here ('wall' is needed to match the prefetch)
+    calibrations = WallCalibration.objects.only(
+        'id', 'wall', 'name', 'calibration_type', 'is_active',
+        'perspective_transform', 'manual_image_points', 'manual_svg_points',
+    )
+    walls = Wall.objects.only('id', 'name', 'svg_file', 'wall_image').prefetch_related(
+        Prefetch('calibrations', queryset=calibrations)
+    )
+    
+    for wall in walls.iterator(chunk_size=200):
         print(f"\n=== Wall: {wall.name} (ID: {wall.id}) ===")
         
         # Check if wall has SVG and image
@@ -43,6 +59,22 @@ def test_calibration_transformation():
         if not calibrations:
             print("  No calibrations found for this wall")
             continue
+        
+        # Transform the sample point with all valid 3x3 matrices of this wall
+        # in one batch, in homogeneous coordinates. Near-zero w gives NaN.
+        matrices = {}
+        for calibration in calibrations:
+            matrix = as_3x3_matrix(calibration.perspective_transform)
+            if matrix is not None:
+                matrices[calibration.id] = matrix
+        transformed_points = {}
+        if matrices:
+            points = np.einsum('nij,j->ni', np.stack(list(matrices.values())),
+                               np.array([100, 100, 1.0]))
+            w = points[:, 2:3]
+            valid = np.abs(w) > 1e-8
+            results = np.where(valid, points[:, :2] / np.where(valid, w, 1.0), np.nan)
+            transformed_points = dict(zip(matrices, results))
             
         for calibration in calibrations:
             print(f"\n  --- Calibration: {calibration.name} (ID: {calibration.id}) ---")
@@ -54,26 +86,18 @@ def test_calibration_transformation():
                 transform = calibration.perspective_transform
                 print(f"  Perspective Transform: {transform}")
                 
-                # Verify it's a 3x3 matrix
-                if isinstance(transform, list) and len(transform) == 3:
-                    if all(isinstance(row, list) and len(row) == 3 for row in transform):
-                        print("  ✓ Transform matrix has correct dimensions (3x3)")
-                        
-                        # Convert to numpy array for testing
-                        np_transform = np.array(transform, dtype=np.float32)
-                        print(f"  Numpy array shape: {np_transform.shape}")
-                        
-                        # Test transformation with a sample point
-                        test_point = np.array([100, 100, 1.0])  # Sample point in homogeneous coordinates
-                        transformed = np_transform @ test_point
-                        
-                        if transformed[2] != 0:
-                            result = (transformed[0] / transformed[2], transformed[1] / transformed[2])
-                            print(f"  Test point [100, 100] transforms to [{result[0]:.2f}, {result[1]:.2f}]")
-                        else:
-                            print("  ✗ Transform results in invalid homogeneous coordinates")
+                # Verify it's a 3x3 matrix (checked when converting it above)
+                if calibration.id in matrices:
+                    print("  ✓ Transform matrix has correct dimensions (3x3)")
+                    print(f"  Numpy array shape: {matrices[calibration.id].shape}")
+                    
+                    # Result for the sample point [100, 100]
+                    result = transformed_points[calibration.id]
+                    
+                    if not np.isnan(result[0]):
+                        print(f"  Test point [100, 100] transforms to [{result[0]:.2f}, {result[1]:.2f}]")
                     else:
-                        print("  ✗ Transform matrix rows don't have 3 elements each")
+                        print("  ✗ Transform results in invalid homogeneous coordinates")
                 else:
                     print("  ✗ Transform matrix is not a 3x3 matrix")
             else:
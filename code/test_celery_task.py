@@ -8,6 +8,7 @@ import sys
 import django
 import time
 from datetime import datetime
+from django.db.models import Prefetch
 
 # Setup Django
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'app.settings')
@@ -24,19 +25,25 @@ def test_task_creation():
     print("Testing WebSocket Pose Session Tracker Celery Task")
     print("=" * 60)
     
-    # Get the first wall for testing
+    # Get the first wall for testing, with its calibrations ordered active
+    # first, then newest first ('wall' is needed to match the prefetch)
     try:
-        wall = Wall.objects.first()
+        calibrations = WallCalibration.objects.only(
+            'id', 'wall', 'name', 'is_active', 'created'
+        ).order_by('-is_active', '-created')
+        wall = Wall.objects.prefetch_related(
+            Prefetch('calibrations', queryset=calibrations)
+        ).first()
         if not wall:
             print("No walls found in database. Please create a wall first.")
             return False
         
         print(f"Using wall: {wall.name} (ID: {wall.id})")
         
-        # Check if wall has calibration
-        calibration = wall.calibrations.filter(is_active=True).first()
-        if not calibration:
-            calibration = wall.calibrations.latest('created')
+        # Use the newest active calibration, or else the newest one. Index the
+        # prefetched list; filtering the manager would query again.
+        wall_calibrations = wall.calibrations.all()
+        calibration = wall_calibrations[0] if wall_calibrations else None
         
         if not calibration:
             print("No calibration found for wall. Please create a calibration first.")
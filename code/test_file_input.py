@@ -4,7 +4,6 @@ Test script to verify the file input functionality of pose_streamer.py
 """
 
 import subprocess
-import time
 import sys
 import os
 
@@ -27,42 +26,24 @@ def test_file_input():
         text=True
     )
     
-    # Print some output while running
-    start_time = time.time()
-    output_lines = []
-    
-    # Let it run for a longer time to ensure the video completes
-    # but check output periodically
-    while time.time() - start_time < 15:
-        time.sleep(1)
-        # Check if there's any output
-        if process.poll() is not None:
-            break
-    
-    # Get any remaining output
-    remaining_output, _ = process.communicate()
-    if remaining_output:
-        output_lines.append(remaining_output)
-    
-    # Check if the process is still running
-    if process.poll() is None:
+    # Give the video up to 15 seconds to complete, returning as soon as the
+    # process exits and collecting its output meanwhile
+    try:
+        output, _ = process.communicate(timeout=15)
+        completed = True
+        print("Process has completed on its own.")
+    except subprocess.TimeoutExpired:
         print("Process is still running after 15 seconds...")
         # Terminate the process
         process.terminate()
-        process.wait()
+        output, _ = process.communicate()
+        completed = False
         print("Process terminated.")
-        if output_lines:
-            print("Output while running:")
-            for line in output_lines:
-                print(line[:200])  # Truncate long lines
-        return False
-    else:
-        print("Process has completed on its own.")
-        if output_lines:
-            print("Output while running:")
-            for line in output_lines:
-                print(line[:200])  # Truncate long lines
-        return True
+    
+    if output:
+        print("Output while running:")
+        print(output[:200])  # Truncate long output
+    return completed
 
 def test_file_input_with_loop():
     """Test the file input functionality with looping"""
@@ -84,19 +65,17 @@ def test_file_input_with_loop():
     )
     
     # Let it run for a longer time to ensure the video loops
-    time.sleep(10)
-    
-    # Check if the process is still running
-    if process.poll() is None:
-        print("Process is still running after 5 seconds (expected with loop)...")
+    try:
+        stdout, stderr = process.communicate(timeout=10)
+    except subprocess.TimeoutExpired:
+        print("Process is still running after 10 seconds (expected with loop)...")
         # Terminate the process
         process.terminate()
-        process.wait()
+        process.communicate()
         print("Process terminated.")
         return True
     else:
         print("Process has completed unexpectedly.")
-        stdout, stderr = process.communicate()
         if stdout:
             print("STDOUT:", stdout)
         if stderr: